@@ -10,7 +10,9 @@ This DAG orchestrates the end-to-end pipeline for processing medical data:
 6. Quality monitoring and error handling
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
+import hashlib
 import os
 from pathlib import Path
 import json
@@ -24,9 +26,86 @@ from airflow.models import Variable
 from airflow.sensors.filesystem import FileSensor
 
 # Import the medical data pipeline
-from src.pipeline.ingestion_pipeline import MedicalDataIngestionPipeline
+from src.pipeline.ingestion_pipeline import (
+    IngestionPipeline,
+    PIPELINE_SUPPORTED_EXTENSIONS,
+)
+from src.extraction.utils import iter_files
+
+
+# Entity types counted in the ingestion report, keyed by entity type
+ENTITY_COUNT_KEYS = {
+    'CONDITION': 'conditions',
+    'MEDICATION': 'medications',
+    'SYMPTOM': 'symptoms',
+    'PROCEDURE': 'procedures',
+    'LAB_RESULT': 'lab_results',
+}
+
+# Registry of processed files: {path: {"mtime_ns", "size", "timestamp", "status"}}
+REGISTRY_PATH = os.path.join('processed_data', 'file_registry', 'processed_files.json')
+
+# Airflow Variable holding {input_dir: bundle version} for fully processed directories
+BUNDLE_HASH_VARIABLE = 'medical_bundle_hashes'
+
+
+def load_file_registry():
+    """
+    Load the registry of processed files, upgrading the legacy list-of-paths format.
+    """
+    if not os.path.exists(REGISTRY_PATH):
+        return {}
+    with open(REGISTRY_PATH, 'r') as f:
+        registry = json.load(f)
+    if isinstance(registry, list):
+        # Legacy entries carry no file stats and are treated as unchanged
+        registry = {file_path: {'status': 'success'} for file_path in registry}
+    return registry
 
 
+def save_file_registry(registry):
+    """
+    Write the registry atomically so a failed run never leaves it truncated.
+    """
+    os.makedirs(os.path.dirname(REGISTRY_PATH), exist_ok=True)
+    tmp_path = REGISTRY_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp_path, REGISTRY_PATH)
+
+
+def is_file_unchanged(entry, mtime_ns, size):
+    """
+    Check a file's current mtime and size against its registry entry.
+    """
+    if 'mtime_ns' not in entry:
+        return True
+    return mtime_ns == entry['mtime_ns'] and size == entry['size']
+
+
+def scan_input_dir(input_dir):
+    """
+    Stat the ingestible files under an input directory.
+    
+    Returns a dict of path -> (mtime_ns, size) and a bundle version: the
+    SHA-256 of the sorted (relative path, mtime_ns, size) records, which
+    changes whenever a file is added, removed or modified.
+    """
+    records = {}
+    for path in iter_files(input_dir, PIPELINE_SUPPORTED_EXTENSIONS):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        records[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    
+    digest = hashlib.sha256()
+    for file_path in sorted(records):
+        mtime_ns, size = records[file_path]
+        record = f"{os.path.relpath(file_path, input_dir)}\0{mtime_ns}\0{size}\n"
+        digest.update(record.encode('utf-8', 'surrogateescape'))
+    return records, digest.hexdigest()
+
 # Default arguments for tasks
 default_args = {
     'owner': 'airflow',
@@ -66,31 +145,46 @@ def detect_new_files(**context):
         'input/csv_data',
     ]
     
-    # Get the directory where processed files are tracked
-    processed_files_dir = 'processed_data/file_registry'
-    os.makedirs(processed_files_dir, exist_ok=True)
-    
-    # Path to the registry of processed files
-    registry_path = os.path.join(processed_files_dir, 'processed_files.json')
+    # Bundle versions of directories whose files were all processed last time
+    bundle_hashes = Variable.get(BUNDLE_HASH_VARIABLE, default_var={}, deserialize_json=True)
+    updated_hashes = dict(bundle_hashes)
     
-    # Load the registry of processed files
-    processed_files = set()
-    if os.path.exists(registry_path):
-        with open(registry_path, 'r') as f:
-            processed_files = set(json.load(f))
+    # The registry is only loaded if some directory changed
+    registry = None
     
-    # Find new files
+    # Find new files, skipping types the pipeline can't ingest during the walk;
+    # their scan-time [mtime_ns, size] is what gets recorded once they are processed
     new_files = []
+    new_file_stats = {}
     for input_dir in input_dirs:
-        if os.path.exists(input_dir):
-            for root, _, files in os.walk(input_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if file_path not in processed_files:
-                        new_files.append(file_path)
+        records, version = scan_input_dir(input_dir)
+        if bundle_hashes.get(input_dir) == version:
+            continue
+        
+        if registry is None:
+            registry = load_file_registry()
+        
+        dir_new_files = []
+        for file_path, (mtime_ns, size) in records.items():
+            entry = registry.get(file_path)
+            # Files modified since they were processed are picked up again
+            if entry is None or not is_file_unchanged(entry, mtime_ns, size):
+                dir_new_files.append(file_path)
+                new_file_stats[file_path] = [mtime_ns, size]
+        
+        # Only remember the version once nothing in the directory is pending
+        if dir_new_files:
+            new_files.extend(dir_new_files)
+            updated_hashes.pop(input_dir, None)
+        else:
+            updated_hashes[input_dir] = version
+    
+    if updated_hashes != bundle_hashes:
+        Variable.set(BUNDLE_HASH_VARIABLE, updated_hashes, serialize_json=True)
     
     # Push the list of new files to XCom
     context['ti'].xcom_push(key='new_files', value=new_files)
+    context['ti'].xcom_push(key='new_file_stats', value=new_file_stats)
     
     # Return the next task based on whether new files were found
     if new_files:
@@ -106,18 +200,15 @@ def process_files(**context):
     # Get the list of new files from XCom
     ti = context['ti']
     new_files = ti.xcom_pull(task_ids='detect_new_files', key='new_files')
+    new_file_stats = ti.xcom_pull(task_ids='detect_new_files', key='new_file_stats')
     
     # Process each file
     results = []
     success_files = []
     failed_files = []
     
-    # Initialize the pipeline
-    pipeline = MedicalDataIngestionPipeline(
-        use_models=True,
-        store_in_db=True,
-        processed_dir="processed_data"
-    )
+    # Initialize the pipeline (it loads the AI models and stores results in the database)
+    pipeline = IngestionPipeline(processed_dir="processed_data")
     
     # Initialize and integrate vector database
     from src.ai.vectordb.pipeline_integration import create_vector_db_integration
@@ -127,17 +218,14 @@ def process_files(**context):
         use_gpu=False
     )
     
-    # Process each file
-    for file_path in new_files:
-        try:
-            result = pipeline.process_file(file_path)
-            results.append(result)
-            if 'error' not in result:
-                success_files.append(file_path)
-            else:
-                failed_files.append(file_path)
-        except Exception as e:
-            print(f"Error processing file {file_path}: {str(e)}")
+    # Process each file, extracting in parallel across the worker's cores;
+    # failures are reported per file in the results
+    results = pipeline.process_files(new_files, max_workers=os.cpu_count())
+    
+    for file_path, result in zip(new_files, results):
+        if 'error' not in result:
+            success_files.append(file_path)
+        else:
             failed_files.append(file_path)
     
     # Clean up resources
@@ -148,19 +236,23 @@ def process_files(**context):
     ti.xcom_push(key='success_files', value=success_files)
     ti.xcom_push(key='failed_files', value=failed_files)
     
-    # Update the registry of processed files
-    registry_path = os.path.join('processed_data/file_registry', 'processed_files.json')
-    processed_files = set()
-    if os.path.exists(registry_path):
-        with open(registry_path, 'r') as f:
-            processed_files = set(json.load(f))
-    
-    # Add successful files to the registry
-    processed_files.update(success_files)
-    
-    # Save the updated registry
-    with open(registry_path, 'w') as f:
-        json.dump(list(processed_files), f, indent=2)
+    # Add successful files to the registry with the stats seen by the scan, so a
+    # file edited while the batch ran is picked up again on the next run;
+    # rewrite the registry only when there is something to add
+    if success_files:
+        registry = load_file_registry()
+        timestamp = datetime.now().isoformat()
+        for file_path in success_files:
+            mtime_ns, size = new_file_stats[file_path]
+            registry[file_path] = {
+                'mtime_ns': mtime_ns,
+                'size': size,
+                'timestamp': timestamp,
+                'status': 'success',
+            }
+        
+        # Save the updated registry
+        save_file_registry(registry)
         
     # Return the next task based on results
     if failed_files:
@@ -181,6 +273,9 @@ def handle_failures(**context):
     error_dir = 'processed_data/errors'
     os.makedirs(error_dir, exist_ok=True)
     
+    # One timestamp for the whole batch of failures
+    timestamp = datetime.now()
+    
     # Move failed files to error directory
     for file_path in failed_files:
         file_name = os.path.basename(file_path)
@@ -194,7 +289,7 @@ def handle_failures(**context):
             # Log the error
             with open(os.path.join(error_dir, f"{file_name}.error.log"), 'w') as f:
                 f.write(f"Error processing file: {file_path}\n")
-                f.write(f"Timestamp: {datetime.now()}\n")
+                f.write(f"Timestamp: {timestamp}\n")
                 # Add more error details if available
         except Exception as e:
             print(f"Error handling failed file {file_path}: {str(e)}")
@@ -213,9 +308,12 @@ def generate_reports(**context):
     reports_dir = 'processed_data/reports'
     os.makedirs(reports_dir, exist_ok=True)
     
+    # Use the same timestamp for the report body and its file name
+    now = datetime.now()
+    
     # Generate summary report
     report = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now.isoformat(),
         'total_files_processed': len(results),
         'successful_files': len(success_files),
         'failed_files': len(results) - len(success_files),
@@ -228,18 +326,16 @@ def generate_reports(**context):
         }
     }
     
-    # Count extracted entities
+    # Count extracted entities in one pass, without building per-type lists
+    entity_counts = report['entity_counts']
     for result in results:
         if 'ai_analysis' in result and 'entities' in result['ai_analysis']:
-            entities = result['ai_analysis']['entities']
-            report['entity_counts']['conditions'] += len([e for e in entities if e['type'] == 'CONDITION'])
-            report['entity_counts']['medications'] += len([e for e in entities if e['type'] == 'MEDICATION'])
-            report['entity_counts']['symptoms'] += len([e for e in entities if e['type'] == 'SYMPTOM'])
-            report['entity_counts']['procedures'] += len([e for e in entities if e['type'] == 'PROCEDURE'])
-            report['entity_counts']['lab_results'] += len([e for e in entities if e['type'] == 'LAB_RESULT'])
+            type_counts = Counter(e['type'] for e in result['ai_analysis']['entities'])
+            for entity_type, count_key in ENTITY_COUNT_KEYS.items():
+                entity_counts[count_key] += type_counts[entity_type]
     
     # Save the report
-    report_path = os.path.join(reports_dir, f"ingestion_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    report_path = os.path.join(reports_dir, f"ingestion_report_{now.strftime('%Y%m%d_%H%M%S')}.json")
     with open(report_path, 'w') as f:
         json.dump(report, f, indent=2, default=str)
     
@@ -7,8 +7,6 @@ that can be used for similarity search, clustering, and retrieval.
 
 from typing import List, Dict, Any, Optional, Union
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import torch
 from transformers import logging as hf_logging
 import logging
 
@@ -341,12 +339,12 @@ class MedicalEmbedding:
             raise RuntimeError("Embedding model not loaded")
             
         # Create a version with medical context terms added
-        enhanced_text = text
+        text_lower = text.lower()
         
         # Add relevant context terms if they're not already in the text
-        for term in context_terms:
-            if term.lower() not in text.lower():
-                enhanced_text += f" {term}"
+        enhanced_text = " ".join(
+            [text] + [term for term in context_terms if term.lower() not in text_lower]
+        )
         
         # Create both standard and enhanced embeddings
         standard_embedding = self.model.encode(text, normalize_embeddings=normalize)
@@ -11,6 +11,40 @@ from typing import Dict, List, Any, Optional
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lowercase keywords that indicate each medical specialty
+SPECIALTY_KEYWORDS = {
+    "Cardiology": ["cardiology", "cardiologist", "heart", "cardiac"],
+    "Neurology": ["neurology", "neurologist", "brain", "nerve"],
+    "Gastroenterology": ["gastroenterology", "gastroenterologist", "digestive", "stomach", "gi"],
+    "Pulmonology": ["pulmonology", "pulmonologist", "lung", "respiratory"],
+    "Endocrinology": ["endocrinology", "endocrinologist", "hormone", "thyroid", "diabetes"],
+    "Rheumatology": ["rheumatology", "rheumatologist", "arthritis", "joint", "autoimmune"],
+    "Dermatology": ["dermatology", "dermatologist", "skin"],
+    "Orthopedics": ["orthopedics", "orthopedist", "bone", "joint", "sports medicine"],
+    "Gynecology": ["gynecology", "gynecologist", "obgyn", "women's health"],
+    "Urology": ["urology", "urologist", "bladder", "kidney"],
+    "Ophthalmology": ["ophthalmology", "ophthalmologist", "eye", "vision"],
+    "ENT": ["ent", "ear nose and throat", "otolaryngology", "otolaryngologist", "ear", "nose", "throat"],
+    "Psychiatry": ["psychiatry", "psychiatrist", "mental health"],
+    "Nephrology": ["nephrology", "nephrologist", "kidney", "renal"],
+    "Hematology": ["hematology", "hematologist", "blood"],
+    "Oncology": ["oncology", "oncologist", "cancer"],
+    "Primary Care": ["primary care", "family medicine", "general practice", "family doctor", "internist"]
+}
+
+_SPECIALTY_TERMS = frozenset(k for keywords in SPECIALTY_KEYWORDS.values() for k in keywords)
+
+# Longest-first lookahead alternation: at each position it reports the longest
+# keyword starting there, and every shorter keyword that matches at the same
+# position is a prefix of it, so _SPECIALTY_TERM_PREFIXES recovers those too
+_SPECIALTY_TERM_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_SPECIALTY_TERMS, key=len, reverse=True)) + "))"
+)
+_SPECIALTY_TERM_PREFIXES = {
+    term: frozenset(k for k in _SPECIALTY_TERMS if term.startswith(k))
+    for term in _SPECIALTY_TERMS
+}
+
 class MedicalEntityExtractor:
     """Extracts medical entities from text using NLP models."""
     
@@ -99,35 +133,17 @@ class MedicalEntityExtractor:
         """
         logger.debug(f"Extracting specialty from text ({len(text)} chars)")
         
-        specialties = {
-            "Cardiology": ["cardiology", "cardiologist", "heart", "cardiac"],
-            "Neurology": ["neurology", "neurologist", "brain", "nerve"],
-            "Gastroenterology": ["gastroenterology", "gastroenterologist", "digestive", "stomach", "gi"],
-            "Pulmonology": ["pulmonology", "pulmonologist", "lung", "respiratory"],
-            "Endocrinology": ["endocrinology", "endocrinologist", "hormone", "thyroid", "diabetes"],
-            "Rheumatology": ["rheumatology", "rheumatologist", "arthritis", "joint", "autoimmune"],
-            "Dermatology": ["dermatology", "dermatologist", "skin"],
-            "Orthopedics": ["orthopedics", "orthopedist", "bone", "joint", "sports medicine"],
-            "Gynecology": ["gynecology", "gynecologist", "obgyn", "women's health"],
-            "Urology": ["urology", "urologist", "bladder", "kidney"],
-            "Ophthalmology": ["ophthalmology", "ophthalmologist", "eye", "vision"],
-            "ENT": ["ent", "ear nose and throat", "otolaryngology", "otolaryngologist", "ear", "nose", "throat"],
-            "Psychiatry": ["psychiatry", "psychiatrist", "mental health"],
-            "Nephrology": ["nephrology", "nephrologist", "kidney", "renal"],
-            "Hematology": ["hematology", "hematologist", "blood"],
-            "Oncology": ["oncology", "oncologist", "cancer"],
-            "Primary Care": ["primary care", "family medicine", "general practice", "family doctor", "internist"]
-        }
-        
         text_lower = text.lower()
         
+        # Find every keyword present in a single scan of the text
+        found = set()
+        for match in _SPECIALTY_TERM_PATTERN.finditer(text_lower):
+            found |= _SPECIALTY_TERM_PREFIXES[match.group(1)]
+        
         # Look for direct mentions of specialties
         matches = {}
-        for specialty, keywords in specialties.items():
-            count = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    count += 1
+        for specialty, keywords in SPECIALTY_KEYWORDS.items():
+            count = sum(1 for keyword in keywords if keyword in found)
             if count > 0:
                 matches[specialty] = count
         
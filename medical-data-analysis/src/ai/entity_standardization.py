@@ -11,6 +11,21 @@ from typing import Dict, Any, Optional, List, Union
 
 logger = logging.getLogger(__name__)
 
+# Dosage clean-up rules, compiled once and applied in order by standardize_dosage
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DOSAGE_SUBSTITUTIONS = [
+    # Standardize common abbreviations
+    (re.compile(r'\bmg\b', re.IGNORECASE), 'mg'),
+    (re.compile(r'\bml\b', re.IGNORECASE), 'mL'),
+    (re.compile(r'\bmcg\b', re.IGNORECASE), 'μg'),
+    # Standardize frequency notation
+    (re.compile(r'\bq(\d+)h\b', re.IGNORECASE), r'every \1 hours'),
+    (re.compile(r'\bqd\b', re.IGNORECASE), 'daily'),
+    (re.compile(r'\bbid\b', re.IGNORECASE), 'twice daily'),
+    (re.compile(r'\btid\b', re.IGNORECASE), 'three times daily'),
+    (re.compile(r'\bqid\b', re.IGNORECASE), 'four times daily'),
+]
+
 # Sample mappings for standardization - would be more extensive in production
 CONDITION_MAPPINGS = {
     "diabetes": "Diabetes Mellitus",
@@ -67,19 +82,20 @@ def standardize_medical_entity(entity: Dict[str, Any]) -> Dict[str, Any]:
     standardized = entity.copy()
     
     # Get entity name/text from either field
-    entity_text = standardized.get("text", standardized.get("name", "")).lower()
+    display_text = standardized.get("text", standardized.get("name", ""))
+    entity_text = display_text.lower()
     
     # Add standard name field expected by tests
     if "standard_name" not in standardized:
         if entity_type == "condition" or entity_type == "diagnosis":
-            standardized["standard_name"] = CONDITION_MAPPINGS.get(entity_text, standardized.get("text", standardized.get("name", "")))
+            standardized["standard_name"] = CONDITION_MAPPINGS.get(entity_text, display_text)
             
             # Add ICD-10 code if missing
             if "icd10" not in standardized:
                 standardized["icd10"] = get_icd10_code(entity_text)
                 
         elif entity_type == "medication" or entity_type == "drug":
-            standardized["standard_name"] = MEDICATION_MAPPINGS.get(entity_text, standardized.get("text", standardized.get("name", "")))
+            standardized["standard_name"] = MEDICATION_MAPPINGS.get(entity_text, display_text)
             
             # Try to standardize dosage format
             if "dosage" in standardized:
@@ -87,11 +103,11 @@ def standardize_medical_entity(entity: Dict[str, Any]) -> Dict[str, Any]:
                 
         elif entity_type == "symptom":
             # Keep original for symptoms that don't have standard mappings
-            standardized["standard_name"] = standardized.get("text", standardized.get("name", ""))
+            standardized["standard_name"] = display_text
             
         elif entity_type == "treatment":
             # Keep original for treatments that don't have standard mappings
-            standardized["standard_name"] = standardized.get("text", standardized.get("name", ""))
+            standardized["standard_name"] = display_text
                 
         elif entity_type == "lab_result":
             # Standardize lab result names and units
@@ -164,19 +180,11 @@ def standardize_dosage(dosage: str) -> str:
         Standardized dosage string
     """
     # Remove extra spaces
-    dosage = re.sub(r'\s+', ' ', dosage.strip())
+    dosage = WHITESPACE_PATTERN.sub(' ', dosage.strip())
     
-    # Standardize common abbreviations
-    dosage = re.sub(r'\bmg\b', 'mg', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\bml\b', 'mL', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\bmcg\b', 'μg', dosage, flags=re.IGNORECASE)
-    
-    # Standardize frequency notation
-    dosage = re.sub(r'\bq(\d+)h\b', r'every \1 hours', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\bqd\b', 'daily', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\bbid\b', 'twice daily', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\btid\b', 'three times daily', dosage, flags=re.IGNORECASE)
-    dosage = re.sub(r'\bqid\b', 'four times daily', dosage, flags=re.IGNORECASE)
+    # Standardize abbreviations and frequency notation
+    for pattern, replacement in DOSAGE_SUBSTITUTIONS:
+        dosage = pattern.sub(replacement, dosage)
     
     return dosage
 
@@ -6,6 +6,7 @@ including entity extraction, text analysis, and relationship recognition.
 """
 
 import logging
+import re
 from typing import Dict, List, Any, Optional, Union
 import numpy as np
 import os
@@ -21,6 +22,32 @@ from src.ai.embedding import MedicalEmbedding
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns for rule-based medical event extraction, compiled once at import time
+EVENT_DATE_PATTERN = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b')
+
+SYMPTOM_PATTERNS = [
+    (re.compile(r'\b(pain)\b', re.IGNORECASE), 'symptom'),
+    (re.compile(r'\b(fatigue)\b', re.IGNORECASE), 'symptom'),
+    (re.compile(r'\b(dizziness)\b', re.IGNORECASE), 'symptom'),
+    (re.compile(r'\b(nausea)\b', re.IGNORECASE), 'symptom')
+]
+
+CONDITION_PATTERNS = [
+    (re.compile(r'\b(EDS|Ehlers[- ]Danlos|hypermobility)\b', re.IGNORECASE), 'condition'),
+    (re.compile(r'\b(POTS|postural orthostatic tachycardia)\b', re.IGNORECASE), 'condition'),
+    (re.compile(r'\b(autism|ASD|autism spectrum)\b', re.IGNORECASE), 'condition')
+]
+
+# All entity patterns as one alternation (group eN = pattern N) so the text is scanned once
+EVENT_ENTITY_TYPES = [event_type for _, event_type in SYMPTOM_PATTERNS + CONDITION_PATTERNS]
+EVENT_ENTITY_PATTERN = re.compile(
+    "|".join(
+        f"(?P<e{i}>{pattern.pattern})"
+        for i, (pattern, _) in enumerate(SYMPTOM_PATTERNS + CONDITION_PATTERNS)
+    ),
+    re.IGNORECASE
+)
+
 def load_nlp_model(model_name: str):
     """
     Load an NLP model for medical text processing.
@@ -484,48 +511,30 @@ class MedicalAIIntegration:
         # Simplified implementation for testing
         events = []
         
-        # Extract dates using regex
-        import re
-        date_pattern = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b')
-        
-        # Extract symptom and condition mentions
-        symptom_patterns = [
-            (r'\b(pain)\b', 'symptom'),
-            (r'\b(fatigue)\b', 'symptom'),
-            (r'\b(dizziness)\b', 'symptom'),
-            (r'\b(nausea)\b', 'symptom')
-        ]
-        
-        condition_patterns = [
-            (r'\b(EDS|Ehlers[- ]Danlos|hypermobility)\b', 'condition'),
-            (r'\b(POTS|postural orthostatic tachycardia)\b', 'condition'),
-            (r'\b(autism|ASD|autism spectrum)\b', 'condition')
-        ]
-        
         # Find dates
-        dates = [m.group(0) for m in date_pattern.finditer(text)]
+        dates = [m.group(0) for m in EVENT_DATE_PATTERN.finditer(text)]
         
         # Use document date if no dates found
         if not dates:
             dates = [document_date.strftime('%Y-%m-%d')]
             
-        # Find medical entities
+        # Find medical entities in a single pass, grouped by pattern in declaration order
+        matches = sorted(EVENT_ENTITY_PATTERN.finditer(text), key=lambda m: int(m.lastgroup[1:]))
+        mentions = []
+        for match in matches:
+            # Context window - 100 chars before and after the match
+            start = max(0, match.start() - 100)
+            end = min(len(text), match.end() + 100)
+            mentions.append((EVENT_ENTITY_TYPES[int(match.lastgroup[1:])], match.group(0), text[start:end]))
+        
+        # The same mentions apply to every date found in the document
         for date in dates:
-            # Find symptoms around this date
-            for pattern, event_type in symptom_patterns + condition_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                
-                for match in matches:
-                    # Context window - 100 chars before and after the match
-                    start = max(0, match.start() - 100)
-                    end = min(len(text), match.end() + 100)
-                    context = text[start:end]
-                    
-                    events.append({
-                        "date": date,
-                        "type": event_type,
-                        "entity": match.group(0),
-                        "context": context
-                    })
+            for event_type, entity, context in mentions:
+                events.append({
+                    "date": date,
+                    "type": event_type,
+                    "entity": entity,
+                    "context": context
+                })
         
         return events 
\ No newline at end of file
@@ -204,26 +204,17 @@ class MedicalTextAnalyzer:
         # Simple key term extraction 
         key_terms = []
         
-        # Check for specialty terms
-        for specialty, terms in self.specialties.items():
-            for term in terms:
-                if term.lower() in text.lower():
-                    key_terms.append(specialty)
-                    break
-        
-        # Check for lab test terms
-        for test, terms in self.lab_tests.items():
-            for term in terms:
-                if term.lower() in text.lower():
-                    key_terms.append(test)
-                    break
-        
-        # Check for procedure terms
-        for procedure, terms in self.procedures.items():
-            for term in terms:
-                if term.lower() in text.lower():
-                    key_terms.append(procedure)
-                    break
+        # Lowercase the text once rather than for every term checked
+        text_lower = text.lower()
+        append = key_terms.append
+        
+        # Check for specialty, lab test and procedure terms
+        for term_groups in (self.specialties, self.lab_tests, self.procedures):
+            for name, terms in term_groups.items():
+                for term in terms:
+                    if term.lower() in text_lower:
+                        append(name)
+                        break
         
         return list(set(key_terms))  # Remove duplicates
     
@@ -9,6 +9,12 @@ import numpy as np
 import os
 from typing import Dict, List, Any, Union, Optional, Tuple
 
+# orjson parses the large vector files considerably faster when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,6 +26,46 @@ class NumpyEncoder(json.JSONEncoder):
             return obj.tolist()
         return json.JSONEncoder.default(self, obj)
 
+def _load_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _numpy_default(obj: Any) -> Any:
+    """orjson fallback for numpy arrays it can't serialize natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dump_json(path: str, obj: Any) -> None:
+    """
+    Write a JSON file, using orjson when it is installed.
+    
+    The document is serialized before the file is touched and written through
+    a temp file, so a serialization error never truncates existing data.
+    """
+    serialized = None
+    if orjson is not None:
+        try:
+            serialized = orjson.dumps(
+                obj,
+                default=_numpy_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the json module handles those
+            serialized = None
+    if serialized is None:
+        serialized = json.dumps(obj, default=_numpy_default).encode('utf-8')
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(serialized)
+    os.replace(tmp_path, path)
+
 class MedicalVectorStore:
     """Store and retrieve vector embeddings for medical entities."""
     
@@ -49,15 +95,13 @@ class MedicalVectorStore:
         """Load vector and metadata data from disk."""
         try:
             if os.path.exists(self.vector_file):
-                with open(self.vector_file, 'r') as f:
-                    vector_data = json.load(f)
-                    # Convert lists back to numpy arrays
-                    self.vectors = {k: np.array(v) for k, v in vector_data.items()}
+                vector_data = _load_json(self.vector_file)
+                # Convert lists back to numpy arrays
+                self.vectors = {k: np.array(v) for k, v in vector_data.items()}
                 logger.info(f"Loaded {len(self.vectors)} vectors from {self.vector_file}")
             
             if os.path.exists(self.metadata_file):
-                with open(self.metadata_file, 'r') as f:
-                    self.metadata = json.load(f)
+                self.metadata = _load_json(self.metadata_file)
                 logger.info(f"Loaded metadata for {len(self.metadata)} entities from {self.metadata_file}")
         
         except Exception as e:
@@ -69,11 +113,8 @@ class MedicalVectorStore:
     def _save_data(self):
         """Save vector and metadata data to disk."""
         try:
-            with open(self.vector_file, 'w') as f:
-                json.dump(self.vectors, f, cls=NumpyEncoder)
-            
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f)
+            _dump_json(self.vector_file, self.vectors)
+            _dump_json(self.metadata_file, self.metadata)
             
             logger.info(f"Saved {len(self.vectors)} vectors and metadata to disk")
         
@@ -129,8 +170,13 @@ class MedicalVectorStore:
         success_count = 0
         for entity in entities:
             if "id" in entity and "embedding" in entity and "metadata" in entity:
-                if self.add_entity(entity["id"], entity["embedding"], entity["metadata"]):
-                    success_count += 1
+                self.vectors[entity["id"]] = entity["embedding"]
+                self.metadata[entity["id"]] = entity["metadata"]
+                success_count += 1
+        
+        # Write the store once for the whole batch rather than once per entity
+        if success_count:
+            self._save_data()
         
         return success_count
     
@@ -166,15 +212,14 @@ class MedicalVectorStore:
         if not self.vectors:
             return []
         
-        # Calculate similarities
-        similarities = []
-        for entity_id, embedding in self.vectors.items():
-            # Calculate cosine similarity
-            similarity = self._calculate_similarity(query_embedding, embedding)
-            similarities.append((entity_id, similarity))
+        # Score every stored vector with one matrix-vector product
+        entity_ids = list(self.vectors)
+        matrix = np.vstack([np.asarray(v, dtype=float).ravel() for v in self.vectors.values()])
+        scores = self._calculate_similarities(np.asarray(query_embedding, dtype=float).ravel(), matrix)
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        # Sort by similarity (descending), keeping insertion order among ties
+        order = np.argsort(-scores, kind="stable")
+        similarities = [(entity_ids[i], float(scores[i])) for i in order]
         
         # Return top k results
         results = []
@@ -211,6 +256,27 @@ class MedicalVectorStore:
         # Calculate cosine similarity
         return float(np.dot(embedding1_normalized, embedding2_normalized))
     
+    def _calculate_similarities(self, query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """
+        Calculate cosine similarity between a query and each row of a matrix.
+        
+        Args:
+            query: Query embedding vector
+            matrix: Embeddings to compare against, one per row
+        
+        Returns:
+            Array of cosine similarities, 0.0 where either vector has zero norm
+        """
+        query_norm = np.linalg.norm(query)
+        row_norms = np.linalg.norm(matrix, axis=1)
+        if query_norm == 0:
+            return np.zeros(len(matrix))
+        
+        scores = np.zeros(len(matrix))
+        nonzero = row_norms != 0
+        scores[nonzero] = (matrix[nonzero] / row_norms[nonzero, None]) @ (query / query_norm)
+        return scores
+    
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate an embedding for the given text.
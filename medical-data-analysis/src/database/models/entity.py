@@ -55,10 +55,11 @@ class Patient(Base):
             self.id = str(uuid.uuid4())
         
         # Set timestamps if not provided
+        now = datetime.now()
         if not hasattr(self, 'created_at') or self.created_at is None:
-            self.created_at = datetime.now()
+            self.created_at = now
         
-        self.updated_at = datetime.now()
+        self.updated_at = now
 
     @property
     def name(self):
@@ -91,10 +92,11 @@ class HealthcareProvider(Base):
             self.id = str(uuid.uuid4())
         
         # Set timestamps if not provided
+        now = datetime.now()
         if not hasattr(self, 'created_at') or self.created_at is None:
-            self.created_at = datetime.now()
+            self.created_at = now
         
-        self.updated_at = datetime.now()
+        self.updated_at = now
 
 class Document(Base):
     """Document model representing a medical document."""
@@ -203,10 +205,11 @@ class MedicalEvent(Base):
             self.id = str(uuid.uuid4())
         
         # Set timestamps if not provided
+        now = datetime.now()
         if not hasattr(self, 'created_at') or self.created_at is None:
-            self.created_at = datetime.now()
+            self.created_at = now
         
-        self.updated_at = datetime.now()
+        self.updated_at = now
 
 # Define association tables and add relationships after all models are defined
 def setup_relationships():
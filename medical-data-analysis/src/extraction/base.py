@@ -11,6 +11,18 @@ import pandas as pd
 
 from src.config import settings
 
+# Patterns used by every extractor, compiled once at import time
+FILENAME_DATE_PATTERN = re.compile(r'(\d{4}[-_/]\d{1,2}[-_/]\d{1,2}|\d{1,2}[-_/]\d{1,2}[-_/]\d{4})')
+YEAR_FIRST_DATE_PATTERN = re.compile(r'\d{4}-\d{1,2}-\d{1,2}')
+YEAR_LAST_DATE_PATTERN = re.compile(r'\d{1,2}-\d{1,2}-\d{4}')
+PROVIDER_CONTEXT_PATTERN = re.compile(
+    r'\b(appointment|visit|consult|referred|prescribed|diagnosed|examination|clinic|hospital)\b',
+    re.IGNORECASE
+)
+
+# Output directories already created by save_to_processed in this process
+_created_dirs: Set[Path] = set()
+
 
 class BaseExtractor(ABC):
     """Base class for all document extractors. Defines the common interface and utility methods."""
@@ -41,6 +53,10 @@ class BaseExtractor(ABC):
             r'date of appointment', r'date of service', r'seen on',
             r'encounter date', r'date seen'
         ]
+        self.appointment_indicator_pattern = re.compile(
+            '|'.join(self.appointment_indicators),
+            re.IGNORECASE
+        )
         
         self.logger = logging.getLogger(self.__class__.__name__)
     
@@ -98,19 +114,19 @@ class BaseExtractor(ABC):
         filename = self.source_file.stem
         
         # Look for date patterns in filename
-        date_matches = re.findall(r'(\d{4}[-_/]\d{1,2}[-_/]\d{1,2}|\d{1,2}[-_/]\d{1,2}[-_/]\d{4})', filename)
+        date_match = FILENAME_DATE_PATTERN.search(filename)
         
-        if date_matches:
-            date_str = date_matches[0]
+        if date_match:
+            date_str = date_match.group(1)
             # Convert to standard format
             date_str = date_str.replace('_', '-').replace('/', '-')
             
             # Determine format and parse
-            if re.match(r'\d{4}-\d{1,2}-\d{1,2}', date_str):
+            if YEAR_FIRST_DATE_PATTERN.match(date_str):
                 # YYYY-MM-DD
                 year, month, day = date_str.split('-')
                 return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-            elif re.match(r'\d{1,2}-\d{1,2}-\d{4}', date_str):
+            elif YEAR_LAST_DATE_PATTERN.match(date_str):
                 # MM-DD-YYYY or DD-MM-YYYY (assume MM-DD-YYYY for US format)
                 month, day, year = date_str.split('-')
                 return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
@@ -152,7 +168,9 @@ class BaseExtractor(ABC):
         # Create directory if it doesn't exist
         file_type = self.source_file.suffix.replace(".", "")
         target_dir = settings.PROCESSED_DIR / file_type
-        os.makedirs(target_dir, exist_ok=True)
+        if target_dir not in _created_dirs:
+            os.makedirs(target_dir, exist_ok=True)
+            _created_dirs.add(target_dir)
         
         # Save with original filename but in the processed directory
         target_file = target_dir / self.source_file.name
@@ -180,6 +198,51 @@ class BaseExtractor(ABC):
         
         return pd.DataFrame(data)
     
+    def _normalize_date_string(self, date_str: str, allow_ambiguous: bool = True) -> Optional[str]:
+        """
+        Normalize a matched date string to YYYY-MM-DD.
+        
+        Shared by every date extraction pass so the format rules live in one place.
+        
+        Args:
+            date_str: Date string in M/D/Y or Y/M/D order, separated by '/' or '-'
+            allow_ambiguous: Treat dates without a 4-digit year as MM/DD/YY;
+                             if False such dates are rejected
+            
+        Returns:
+            Normalized date string, or None if the string can't be normalized
+        """
+        if '/' in date_str:
+            parts = date_str.split('/')
+        elif '-' in date_str:
+            parts = date_str.split('-')
+        else:
+            return None
+            
+        if len(parts) != 3:
+            return None
+            
+        # Handle different formats
+        if len(parts[2]) == 4:  # MM/DD/YYYY
+            month, day, year = parts
+        elif len(parts[0]) == 4:  # YYYY/MM/DD
+            year, month, day = parts
+        elif allow_ambiguous:  # Ambiguous, assume MM/DD/YY
+            month, day, year = parts
+        else:
+            return None
+            
+        # Ensure 4-digit year
+        if len(year) == 2:
+            if not year.isdigit():
+                return None
+            if int(year) > 50:  # Assume 19xx for years > 50
+                year = f"19{year}"
+            else:  # Assume 20xx for years <= 50
+                year = f"20{year}"
+                
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    
     def extract_dates(self) -> Set[str]:
         """
         Extract all dates mentioned in the content.
@@ -193,39 +256,10 @@ class BaseExtractor(ABC):
             return dates
             
         # Extract dates using pattern
-        matches = self.date_pattern.findall(self.content)
-        
-        for date_str in matches:
-            # Try to normalize format
-            try:
-                if '/' in date_str:
-                    parts = date_str.split('/')
-                elif '-' in date_str:
-                    parts = date_str.split('-')
-                else:
-                    continue
-                    
-                # Handle different formats
-                if len(parts) == 3:
-                    if len(parts[2]) == 4:  # MM/DD/YYYY
-                        month, day, year = parts
-                    elif len(parts[0]) == 4:  # YYYY/MM/DD
-                        year, month, day = parts
-                    else:  # Ambiguous, assume MM/DD/YY
-                        month, day, year = parts
-                        
-                    # Ensure 4-digit year
-                    if len(year) == 2:
-                        if int(year) > 50:  # Assume 19xx for years > 50
-                            year = f"19{year}"
-                        else:  # Assume 20xx for years <= 50
-                            year = f"20{year}"
-                            
-                    normalized_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                    dates.add(normalized_date)
-            except:
-                # If parsing fails, add the original string
-                dates.add(date_str)
+        for date_str in self.date_pattern.findall(self.content):
+            normalized_date = self._normalize_date_string(date_str)
+            if normalized_date:
+                dates.add(normalized_date)
                 
         return dates
         
@@ -250,8 +284,7 @@ class BaseExtractor(ABC):
             
             # Check if this looks like a real provider reference 
             # (not just someone with Dr. in their name)
-            if re.search(r'\b(appointment|visit|consult|referred|prescribed|diagnosed|examination|clinic|hospital)\b', 
-                         context, re.IGNORECASE):
+            if PROVIDER_CONTEXT_PATTERN.search(context):
                 providers.append({
                     "name": provider_name,
                     "context": context.strip(),
@@ -271,14 +304,8 @@ class BaseExtractor(ABC):
         if not self.content:
             return appointment_dates
             
-        # Create pattern for appointment date indicators
-        indicator_pattern = re.compile(
-            '|'.join(self.appointment_indicators),
-            re.IGNORECASE
-        )
-        
         # Find all instances of appointment indicators
-        for match in indicator_pattern.finditer(self.content):
+        for match in self.appointment_indicator_pattern.finditer(self.content):
             # Look for a date near this indicator (within 50 chars)
             start = max(0, match.start() - 20)
             end = min(len(self.content), match.end() + 30)
@@ -288,40 +315,13 @@ class BaseExtractor(ABC):
             date_matches = self.date_pattern.findall(context)
             
             for date_str in date_matches:
-                try:
-                    # Normalize the date
-                    if '/' in date_str:
-                        parts = date_str.split('/')
-                    elif '-' in date_str:
-                        parts = date_str.split('-')
-                    else:
-                        continue
-                        
-                    # Handle different formats
-                    if len(parts) == 3:
-                        if len(parts[2]) == 4:  # MM/DD/YYYY
-                            month, day, year = parts
-                        elif len(parts[0]) == 4:  # YYYY/MM/DD
-                            year, month, day = parts
-                        else:  # Ambiguous, assume MM/DD/YY
-                            month, day, year = parts
-                            
-                        # Ensure 4-digit year
-                        if len(year) == 2:
-                            if int(year) > 50:
-                                year = f"19{year}"
-                            else:
-                                year = f"20{year}"
-                                
-                        normalized_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                        
-                        appointment_dates.append({
-                            "date": normalized_date,
-                            "indicator": match.group(0),
-                            "context": context.strip()
-                        })
-                except:
-                    continue
+                normalized_date = self._normalize_date_string(date_str)
+                if normalized_date:
+                    appointment_dates.append({
+                        "date": normalized_date,
+                        "indicator": match.group(0),
+                        "context": context.strip()
+                    })
                     
         # If we found no clear appointment dates, use the most prominent date in the document
         if not appointment_dates and self.metadata.get("file_date"):
@@ -96,13 +96,16 @@ class CSVExtractor(BaseExtractor):
         except Exception as e:
             # Try with different encoding or csv module if pandas fails
             try:
-                with open(self.source_file, 'r', encoding='utf-8-sig') as file:
+                with open(self.source_file, 'r', encoding='utf-8-sig', newline='') as file:
                     reader = csv.reader(file)
-                    rows = list(reader)
+                    header = next(reader, None)
                     
-                if len(rows) > 0:
-                    # Convert to DataFrame for consistent processing
-                    self.df = pd.DataFrame(rows[1:], columns=rows[0])
+                    if header is not None:
+                        # Convert to DataFrame for consistent processing; pandas still
+                        # lists the rows, but passing the reader skips the rows[1:] copy
+                        self.df = pd.DataFrame(reader, columns=header)
+                    
+                if header is not None:
                     self.confidence_score = 0.7
                     return str(self.df)
                 else:
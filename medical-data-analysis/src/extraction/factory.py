@@ -1,14 +1,60 @@
+import importlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Type
 
 from src.extraction.base import BaseExtractor
-from src.extraction.csv_extractor import CSVExtractor
-from src.extraction.markdown_extractor import MarkdownExtractor
-from src.extraction.text_extractor import TextExtractor
-from src.extraction.pdf_extractor import PDFExtractor
-from src.extraction.html_extractor import HTMLExtractor
-from src.extraction.rtf_extractor import RTFExtractor
-from src.extraction.docx_extractor import DOCXExtractor
+
+# Extractor modules are imported on first use, so PDF, HTML, RTF and DOCX
+# libraries are only loaded when a file of that type is actually seen
+EXTRACTOR_CLASSES = {
+    'TextExtractor': 'src.extraction.text_extractor',
+    'MarkdownExtractor': 'src.extraction.markdown_extractor',
+    'CSVExtractor': 'src.extraction.csv_extractor',
+    'PDFExtractor': 'src.extraction.pdf_extractor',
+    'HTMLExtractor': 'src.extraction.html_extractor',
+    'RTFExtractor': 'src.extraction.rtf_extractor',
+    'DOCXExtractor': 'src.extraction.docx_extractor',
+}
+
+# Map file extensions to extractors
+EXTENSION_EXTRACTORS = {
+    '.txt': 'TextExtractor',
+    '.md': 'MarkdownExtractor',
+    '.csv': 'CSVExtractor',
+    '.pdf': 'PDFExtractor',
+    '.html': 'HTMLExtractor',
+    '.htm': 'HTMLExtractor',
+    '.rtf': 'RTFExtractor',
+    '.docx': 'DOCXExtractor',
+    '.doc': 'DOCXExtractor',  # Try to use DOCX extractor for legacy .doc files
+}
+
+# Map inferred content types to extractors
+CONTENT_TYPE_EXTRACTORS = {
+    'text/csv': 'CSVExtractor',
+    'text/markdown': 'MarkdownExtractor',
+    'text/plain': 'TextExtractor',
+    'text/html': 'HTMLExtractor',
+    'application/pdf': 'PDFExtractor',
+    'application/rtf': 'RTFExtractor',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'DOCXExtractor',
+}
+
+
+@lru_cache(maxsize=None)
+def load_extractor_class(name: str) -> Type[BaseExtractor]:
+    """
+    Import and return an extractor class by name.
+    
+    Args:
+        name: Extractor class name, a key of EXTRACTOR_CLASSES
+        
+    Returns:
+        The extractor class
+    """
+    module = importlib.import_module(EXTRACTOR_CLASSES[name])
+    return getattr(module, name)
 
 
 def get_extractor(file_path: Path) -> Optional[BaseExtractor]:
@@ -26,50 +72,24 @@ def get_extractor(file_path: Path) -> Optional[BaseExtractor]:
     
     file_extension = file_path.suffix.lower()
     
-    # Map file extensions to extractors
-    extractors = {
-        '.txt': TextExtractor,
-        '.md': MarkdownExtractor,
-        '.csv': CSVExtractor,
-        '.pdf': PDFExtractor,
-        '.html': HTMLExtractor,
-        '.htm': HTMLExtractor,
-        '.rtf': RTFExtractor,
-        '.docx': DOCXExtractor,
-        '.doc': DOCXExtractor,  # Try to use DOCX extractor for legacy .doc files
-    }
-    
     # Get the extractor class based on file extension
-    extractor_class = extractors.get(file_extension)
+    extractor_name = EXTENSION_EXTRACTORS.get(file_extension)
     
     # If no extractor found by extension, try to infer from content
-    if not extractor_class:
+    if not extractor_name:
         # Try to determine type by reading the first few bytes
         try:
             with open(file_path, 'rb') as f:
                 header = f.read(4096)
                 content_type = infer_content_type(header, file_path.name)
-                if content_type == 'text/csv':
-                    extractor_class = CSVExtractor
-                elif content_type == 'text/markdown':
-                    extractor_class = MarkdownExtractor
-                elif content_type == 'text/plain':
-                    extractor_class = TextExtractor
-                elif content_type == 'text/html':
-                    extractor_class = HTMLExtractor
-                elif content_type == 'application/pdf':
-                    extractor_class = PDFExtractor
-                elif content_type == 'application/rtf':
-                    extractor_class = RTFExtractor
-                elif content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                    extractor_class = DOCXExtractor
+                extractor_name = CONTENT_TYPE_EXTRACTORS.get(content_type)
         except Exception:
             # If we can't read the file or infer the type, default to text
-            extractor_class = TextExtractor
+            extractor_name = 'TextExtractor'
     
     # Create and return the extractor instance if found
-    if extractor_class:
-        return extractor_class()
+    if extractor_name:
+        return load_extractor_class(extractor_name)()
     
     return None
 
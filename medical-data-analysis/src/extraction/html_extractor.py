@@ -8,6 +8,13 @@ import html2text
 
 from src.extraction.base import BaseExtractor
 
+# lxml's C parser is several times faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 
 class HTMLExtractor(BaseExtractor):
     """Extractor for HTML files (medical portals, exported medical records, etc.)."""
@@ -15,6 +22,9 @@ class HTMLExtractor(BaseExtractor):
     def __init__(self):
         super().__init__()
         self.soup = None
+        # Decoded HTML of the current file, read once and shared by metadata and content
+        self.html_content = None
+        self.html_encoding = None
         self.date_pattern = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b')
         self.html_converter = html2text.HTML2Text()
         self.html_converter.ignore_links = False
@@ -29,10 +39,32 @@ class HTMLExtractor(BaseExtractor):
             "family history", "social history", "assessment", "plan", "treatment"
         ]
     
+    def _read_html(self) -> str:
+        """
+        Read and decode the current HTML file, caching the result.
+        
+        Returns:
+            Decoded HTML content
+        """
+        if self.html_content is None:
+            try:
+                self.html_content = self.source_file.read_text(encoding='utf-8')
+                self.html_encoding = 'utf-8'
+            except UnicodeDecodeError:
+                # Try with different encoding if UTF-8 fails
+                self.html_content = self.source_file.read_text(encoding='latin-1')
+                self.html_encoding = 'latin-1'
+        return self.html_content
+    
     def _extract_metadata(self) -> Dict:
         """Extract metadata from the HTML file."""
         metadata = {}
         
+        # Start from a clean slate for each file
+        self.soup = None
+        self.html_content = None
+        self.html_encoding = None
+        
         # Extract date from filename
         file_date = self._extract_date_from_filename()
         if file_date:
@@ -50,31 +82,30 @@ class HTMLExtractor(BaseExtractor):
         
         # Parse HTML with BeautifulSoup for metadata
         try:
-            with open(self.source_file, 'r', encoding='utf-8') as file:
-                self.soup = BeautifulSoup(file, 'html.parser')
-                
-                # Extract title if available
-                title_tag = self.soup.find('title')
-                if title_tag and title_tag.string:
-                    metadata["html_title"] = title_tag.string.strip()
-                
-                # Extract meta tags
-                meta_tags = self.soup.find_all('meta')
-                for meta in meta_tags:
-                    name = meta.get('name')
-                    content = meta.get('content')
-                    if name and content:
-                        metadata[f"meta_{name}"] = content
-                
-                # Look for dates in the HTML content
-                dates = self.extract_dates_from_soup()
-                if dates:
-                    metadata["extracted_dates"] = list(dates)[:5]  # Limit to first 5 dates
-                
-                # Look for medical provider information
-                providers = self.extract_medical_providers_from_soup()
-                if providers:
-                    metadata["medical_providers"] = providers[:3]  # Limit to first 3 providers
+            self.soup = BeautifulSoup(self._read_html(), HTML_PARSER)
+            
+            # Extract title if available
+            title_tag = self.soup.find('title')
+            if title_tag and title_tag.string:
+                metadata["html_title"] = title_tag.string.strip()
+            
+            # Extract meta tags
+            meta_tags = self.soup.find_all('meta')
+            for meta in meta_tags:
+                name = meta.get('name')
+                content = meta.get('content')
+                if name and content:
+                    metadata[f"meta_{name}"] = content
+            
+            # Look for dates in the HTML content
+            dates = self.extract_dates_from_soup()
+            if dates:
+                metadata["extracted_dates"] = list(dates)[:5]  # Limit to first 5 dates
+            
+            # Look for medical provider information
+            providers = self.extract_medical_providers_from_soup()
+            if providers:
+                metadata["medical_providers"] = providers[:3]  # Limit to first 3 providers
         except Exception as e:
             metadata["html_metadata_error"] = str(e)
         
@@ -83,44 +114,27 @@ class HTMLExtractor(BaseExtractor):
     def _extract_content(self) -> str:
         """Extract content from the HTML file."""
         try:
-            # Try with UTF-8 encoding first
-            with open(self.source_file, 'r', encoding='utf-8') as file:
-                html_content = file.read()
-                
-                # Parse with BeautifulSoup for structured extraction
-                if not self.soup:
-                    self.soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Convert HTML to markdown for better text representation
-                markdown_content = self.html_converter.handle(html_content)
-                
-                # Set confidence score based on content extraction
-                if markdown_content and len(markdown_content) > 100:
-                    self.confidence_score = 1.0
-                elif markdown_content:
-                    self.confidence_score = 0.8
-                else:
-                    self.confidence_score = 0.3
-                    
-                return markdown_content
+            # Reuse the HTML already read (and parsed) for metadata
+            html_content = self._read_html()
+            
+            # Parse with BeautifulSoup for structured extraction
+            if not self.soup:
+                self.soup = BeautifulSoup(html_content, HTML_PARSER)
+            
+            # Convert HTML to markdown for better text representation
+            markdown_content = self.html_converter.handle(html_content)
+            
+            # Set confidence score based on content extraction
+            if self.html_encoding != 'utf-8':
+                self.confidence_score = 0.7  # Lower confidence due to encoding issues
+            elif markdown_content and len(markdown_content) > 100:
+                self.confidence_score = 1.0
+            elif markdown_content:
+                self.confidence_score = 0.8
+            else:
+                self.confidence_score = 0.3
                 
-        except UnicodeDecodeError:
-            # Try with different encoding if UTF-8 fails
-            try:
-                with open(self.source_file, 'r', encoding='latin-1') as file:
-                    html_content = file.read()
-                    
-                    # Parse with BeautifulSoup for structured extraction
-                    self.soup = BeautifulSoup(html_content, 'html.parser')
-                    
-                    # Convert HTML to markdown
-                    markdown_content = self.html_converter.handle(html_content)
-                    
-                    self.confidence_score = 0.7  # Lower confidence due to encoding issues
-                    return markdown_content
-            except Exception as e:
-                self.confidence_score = 0.0
-                return f"Error extracting content: {str(e)}"
+            return markdown_content
         except Exception as e:
             self.confidence_score = 0.0
             return f"Error extracting content: {str(e)}"
@@ -286,7 +300,7 @@ class HTMLExtractor(BaseExtractor):
         # This is a simple approach to get text content
         try:
             from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, HTML_PARSER)
             
             # Remove script and style elements
             for script in soup(["script", "style", "meta", "link", "noscript"]):
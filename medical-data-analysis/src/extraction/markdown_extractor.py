@@ -262,16 +262,16 @@ class MarkdownExtractor(BaseExtractor):
         """Extract the date when lab tests were performed."""
         # First check the headers for dates
         for header in self.headers:
-            date_matches = self.date_pattern.findall(header["text"])
-            if date_matches:
-                return self._normalize_date(date_matches[0])
+            date_match = self.date_pattern.search(header["text"])
+            if date_match:
+                return self._normalize_date(date_match.group(1))
         
         # Check the first few lines of content for dates
-        first_lines = self.content.split('\n')[:10]
+        first_lines = self.content.split('\n', 10)[:10]
         for line in first_lines:
-            date_matches = self.date_pattern.findall(line)
-            if date_matches:
-                return self._normalize_date(date_matches[0])
+            date_match = self.date_pattern.search(line)
+            if date_match:
+                return self._normalize_date(date_match.group(1))
                 
         # Use file date as fallback
         if "file_date" in self.metadata:
@@ -1,5 +1,7 @@
 import re
+import mmap
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Any, Union
 
@@ -7,8 +9,120 @@ import PyPDF2
 from pdfminer.high_level import extract_text as pdfminer_extract_text
 from pdfminer.pdfparser import PDFSyntaxError
 
+# PyMuPDF is considerably faster than PyPDF2 at text extraction; use it when installed.
+# Releases before 1.24.3 only provide the legacy `fitz` module name.
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+
+# Optional Aho-Corasick automaton for counting many terms in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from src.extraction.base import BaseExtractor
 
+# PDFs at or above this size are memory-mapped rather than read through a file buffer
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Patterns are compiled once at import time and shared by every extractor instance
+DATE_PATTERN = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b')
+
+# For section detection
+SECTION_PATTERNS = [
+    re.compile(r'(ASSESSMENT|Assessment)[\\s:]+([^\\n]+)'),
+    re.compile(r'(DIAGNOSIS|Diagnosis)[\\s:]+([^\\n]+)'),
+    re.compile(r'(MEDICATIONS|Medications)[\\s:]+([^\\n]+)'),
+    re.compile(r'(ALLERGIES|Allergies)[\\s:]+([^\\n]+)'),
+    re.compile(r'(HISTORY|History)[\\s:]+([^\\n]+)'),
+    re.compile(r'(PHYSICAL EXAMINATION|Physical Examination)[\\s:]+([^\\n]+)'),
+    re.compile(r'(LABS|Labs|LABORATORY|Laboratory)[\\s:]+([^\\n]+)'),
+    re.compile(r'(PLAN|Plan)[\\s:]+([^\\n]+)')
+]
+
+# Common doctor name patterns: Dr. LastName or FirstName LastName, MD
+DR_NAME_PATTERN = re.compile(r'Dr\.\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+MD_NAME_PATTERN = re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+),\s+(?:M\.?D\.?|D\.?O\.?)')
+
+
+def _parse_pdf_date(raw: Any) -> Optional[str]:
+    """
+    Convert a PDF date string (D:YYYYMMDDHHmmSSOHH'mm') to ISO format by slicing.
+    
+    The result is a string rather than a datetime; a UTC offset in the raw
+    value (Z, +HH'mm' or -HH'mm') is kept as an ISO offset such as -05:00.
+    
+    Args:
+        raw: Raw /CreationDate value from the document info dictionary
+        
+    Returns:
+        ISO date or datetime string, or None if the value is not a PDF date
+    """
+    if not raw:
+        return None
+    
+    value = str(raw)
+    if value.startswith("D:"):
+        value = value[2:]
+    
+    digits = value[:14]
+    if len(digits) < 8 or not digits[:8].isdigit():
+        return None
+    
+    iso_date = f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
+    if len(digits) == 14 and digits.isdigit():
+        return f"{iso_date}T{digits[8:10]}:{digits[10:12]}:{digits[12:14]}{_parse_pdf_offset(value[14:])}"
+    return iso_date
+
+
+def _parse_pdf_offset(raw: str) -> str:
+    """Convert the UTC offset suffix of a PDF date to an ISO offset, or '' if absent."""
+    if raw.startswith("Z"):
+        return "+00:00"
+    if raw[:1] in ("+", "-"):
+        offset_digits = raw[1:].replace("'", "")
+        hours, minutes = offset_digits[:2], offset_digits[2:4] or "00"
+        if hours.isdigit() and minutes.isdigit() and len(hours) == 2 and len(minutes) == 2:
+            return f"{raw[0]}{hours}:{minutes}"
+    return ""
+
+
+@lru_cache(maxsize=8)
+def _build_term_automaton(terms: frozenset):
+    """Build (and cache) an Aho-Corasick automaton over a set of terms."""
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, (len(term), term))
+    automaton.make_automaton()
+    return automaton
+
+
+def _term_pattern(term: str) -> "re.Pattern":
+    """Compile a literal marker term for case-insensitive scanning."""
+    return re.compile(re.escape(term), re.IGNORECASE)
+
+
+# Document type markers in priority order: (type, all terms required?, terms).
+# Scanning with IGNORECASE avoids lowercasing a copy of the whole document.
+DOCUMENT_TYPE_RULES = [
+    (doc_type, require_all, tuple(_term_pattern(term) for term in terms))
+    for doc_type, require_all, terms in [
+        ("lab_report", True, ("lab", "result")),
+        ("imaging_report", False, ("radiology", "imaging", "x-ray")),
+        ("clinical_note", True, ("assessment", "plan")),
+        ("prescription", False, ("prescription", "rx")),
+        ("discharge_summary", True, ("discharge", "summary")),
+        ("referral", False, ("referral",)),
+        ("progress_note", True, ("progress", "note")),
+        ("history_physical", True, ("history", "physical")),
+    ]
+]
+
 
 class PDFExtractor(BaseExtractor):
     """Extractor for PDF files (medical records, lab reports, etc.)."""
@@ -18,7 +132,7 @@ class PDFExtractor(BaseExtractor):
         self.total_pages = 0
         self.extracted_pages = []
         self.page_texts = []
-        self.date_pattern = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b')
+        self.date_pattern = DATE_PATTERN
         self.extracted_dates = set()
         self.medical_terms = set([
             "diagnosis", "assessment", "medication", "prescription", "doctor", "physician",
@@ -28,21 +142,57 @@ class PDFExtractor(BaseExtractor):
         ])
         
         # For section detection
-        self.section_patterns = [
-            re.compile(r'(ASSESSMENT|Assessment)[\\s:]+([^\\n]+)'),
-            re.compile(r'(DIAGNOSIS|Diagnosis)[\\s:]+([^\\n]+)'),
-            re.compile(r'(MEDICATIONS|Medications)[\\s:]+([^\\n]+)'),
-            re.compile(r'(ALLERGIES|Allergies)[\\s:]+([^\\n]+)'),
-            re.compile(r'(HISTORY|History)[\\s:]+([^\\n]+)'),
-            re.compile(r'(PHYSICAL EXAMINATION|Physical Examination)[\\s:]+([^\\n]+)'),
-            re.compile(r'(LABS|Labs|LABORATORY|Laboratory)[\\s:]+([^\\n]+)'),
-            re.compile(r'(PLAN|Plan)[\\s:]+([^\\n]+)')
-        ]
+        self.section_patterns = SECTION_PATTERNS
         
         self.pdf_parser = None
+        
+        # Shared PyPDF2 reader (and its backing file/mmap) for the file being processed
+        self._pdf_reader = None
+        self._pdf_file = None
+        self._pdf_mmap = None
+        
+        # Shared PyMuPDF document for the file being processed, when PyMuPDF is installed
+        self._fitz_doc = None
+    
+    def _get_fitz_doc(self) -> "fitz.Document":
+        """Return a PyMuPDF document for the current file, opening it only once."""
+        if self._fitz_doc is None:
+            self._fitz_doc = fitz.open(self.source_file)
+        return self._fitz_doc
+    
+    def _get_pdf_reader(self) -> "PyPDF2.PdfReader":
+        """
+        Return a PyPDF2 reader for the current file, parsing it only once.
+        
+        Metadata and content extraction share the reader. Large files are
+        memory-mapped so pages are paged in on demand instead of buffered.
+        """
+        if self._pdf_reader is None:
+            self._pdf_file = open(self.source_file, 'rb')
+            stream = self._pdf_file
+            if self.source_file.stat().st_size >= MMAP_THRESHOLD:
+                self._pdf_mmap = mmap.mmap(self._pdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+                stream = self._pdf_mmap
+            self._pdf_reader = PyPDF2.PdfReader(stream)
+        return self._pdf_reader
+    
+    def _release_pdf_reader(self) -> None:
+        """Drop the shared readers and close the file/mmap backing them."""
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        self._pdf_reader = None
+        if self._pdf_mmap is not None:
+            self._pdf_mmap.close()
+            self._pdf_mmap = None
+        if self._pdf_file is not None:
+            self._pdf_file.close()
+            self._pdf_file = None
     
     def _extract_metadata(self) -> Dict:
         """Extract metadata from the PDF file."""
+        # Never carry a reader over from a previous file
+        self._release_pdf_reader()
         metadata = {}
         
         # Extract date from filename
@@ -62,66 +212,84 @@ class PDFExtractor(BaseExtractor):
         
         # Try to extract PDF-specific metadata
         try:
-            with open(self.source_file, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                self.total_pages = len(pdf_reader.pages)
-                metadata["page_count"] = self.total_pages
-                
-                # Try to get PDF document info
-                pdf_info = pdf_reader.metadata
-                if pdf_info:
-                    if pdf_info.title:
-                        metadata["title"] = pdf_info.title
-                    if pdf_info.author:
-                        metadata["author"] = pdf_info.author
-                    if pdf_info.subject:
-                        metadata["subject"] = pdf_info.subject
-                    if pdf_info.creator:
-                        metadata["creator"] = pdf_info.creator
-                    if pdf_info.producer:
-                        metadata["producer"] = pdf_info.producer
-                    if pdf_info.creation_date:
-                        metadata["pdf_creation_date"] = pdf_info.creation_date
+            if fitz is not None:
+                self._extract_pdf_info_pymupdf(metadata)
+            else:
+                self._extract_pdf_info_pypdf2(metadata)
         except Exception as e:
+            self._release_pdf_reader()
             metadata["extraction_error"] = str(e)
             
         return metadata
     
+    def _extract_pdf_info_pymupdf(self, metadata: Dict) -> None:
+        """Add page count and document info read with PyMuPDF to metadata."""
+        doc = self._get_fitz_doc()
+        self.total_pages = doc.page_count
+        metadata["page_count"] = self.total_pages
+        
+        pdf_info = doc.metadata or {}
+        for key in ("title", "author", "subject", "creator", "producer"):
+            if pdf_info.get(key):
+                metadata[key] = pdf_info[key]
+        creation_date = _parse_pdf_date(pdf_info.get("creationDate"))
+        if creation_date:
+            metadata["pdf_creation_date"] = creation_date
+    
+    def _extract_pdf_info_pypdf2(self, metadata: Dict) -> None:
+        """Add page count and document info read with PyPDF2 to metadata."""
+        pdf_reader = self._get_pdf_reader()
+        self.total_pages = len(pdf_reader.pages)
+        metadata["page_count"] = self.total_pages
+        
+        # Try to get PDF document info
+        pdf_info = pdf_reader.metadata
+        if pdf_info:
+            if pdf_info.title:
+                metadata["title"] = pdf_info.title
+            if pdf_info.author:
+                metadata["author"] = pdf_info.author
+            if pdf_info.subject:
+                metadata["subject"] = pdf_info.subject
+            if pdf_info.creator:
+                metadata["creator"] = pdf_info.creator
+            if pdf_info.producer:
+                metadata["producer"] = pdf_info.producer
+            # Slice the raw value rather than using PyPDF2's strptime-based
+            # creation_date property; this also keeps metadata JSON-serializable
+            creation_date = _parse_pdf_date(pdf_info.get("/CreationDate"))
+            if creation_date:
+                metadata["pdf_creation_date"] = creation_date
+    
     def _extract_content(self) -> str:
         """
         Extract text content from the PDF file.
-        Uses PyPDF2 first, and falls back to pdfminer.six for better text extraction if needed.
+        Uses PyMuPDF when available (PyPDF2 otherwise), and falls back to pdfminer.six
+        for better text extraction if needed.
         """
         content = ""
+        # Reset per-file page state so earlier documents aren't kept alive
         self.page_texts = []
+        self.extracted_pages = []
         
         try:
-            # First attempt with PyPDF2
-            with open(self.source_file, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                self.total_pages = len(pdf_reader.pages)
-                
-                for i in range(self.total_pages):
-                    try:
-                        page = pdf_reader.pages[i]
-                        page_text = page.extract_text()
-                        
-                        if page_text.strip():  # If text was extracted successfully
-                            self.page_texts.append(page_text)
-                            self.extracted_pages.append(i)
-                        else:
-                            # If PyPDF2 fails to extract text from this page, make a note
-                            self.page_texts.append(f"[Failed to extract text from page {i+1}]")
-                    except Exception as e:
-                        self.page_texts.append(f"[Error extracting page {i+1}: {str(e)}]")
-                
-                content = "\n===== PAGE BREAK =====\n".join(self.page_texts)
-                
-                # If PyPDF2 failed to extract meaningful text, try pdfminer
-                if not content.strip() or "[Failed to extract text" in content:
-                    content = self._extract_with_pdfminer()
+            # First attempt with the fastest available page-level reader
+            try:
+                if fitz is not None:
+                    self._extract_pages_pymupdf()
+                else:
+                    self._extract_pages_pypdf2()
+            finally:
+                # Metadata and pages are done with the shared reader at this point
+                self._release_pdf_reader()
+            
+            content = "\n===== PAGE BREAK =====\n".join(self.page_texts)
+            
+            # If the page reader failed to extract meaningful text, try pdfminer
+            if not content.strip() or "[Failed to extract text" in content:
+                content = self._extract_with_pdfminer()
         except Exception as e:
-            # If PyPDF2 fails completely, try pdfminer
+            # If page-level extraction fails completely, try pdfminer
             content = self._extract_with_pdfminer()
             if not content:
                 content = f"Error extracting content: {str(e)}"
@@ -138,6 +306,37 @@ class PDFExtractor(BaseExtractor):
             
         return content
     
+    def _add_page_text(self, index: int, page_text: str) -> None:
+        """Record the text extracted from one page, noting pages that came back empty."""
+        if page_text.strip():  # If text was extracted successfully
+            self.page_texts.append(page_text)
+            self.extracted_pages.append(index)
+        else:
+            # If the reader fails to extract text from this page, make a note
+            self.page_texts.append(f"[Failed to extract text from page {index+1}]")
+    
+    def _extract_pages_pymupdf(self) -> None:
+        """Extract per-page text using PyMuPDF, reusing the document opened for metadata."""
+        doc = self._get_fitz_doc()
+        self.total_pages = doc.page_count
+        
+        for i in range(self.total_pages):
+            try:
+                self._add_page_text(i, doc.load_page(i).get_text())
+            except Exception as e:
+                self.page_texts.append(f"[Error extracting page {i+1}: {str(e)}]")
+    
+    def _extract_pages_pypdf2(self) -> None:
+        """Extract per-page text using PyPDF2, reusing the reader opened for metadata."""
+        pdf_reader = self._get_pdf_reader()
+        self.total_pages = len(pdf_reader.pages)
+        
+        for i in range(self.total_pages):
+            try:
+                self._add_page_text(i, pdf_reader.pages[i].extract_text())
+            except Exception as e:
+                self.page_texts.append(f"[Error extracting page {i+1}: {str(e)}]")
+    
     def _extract_with_pdfminer(self) -> str:
         """Fallback extraction method using pdfminer.six."""
         try:
@@ -157,37 +356,11 @@ class PDFExtractor(BaseExtractor):
         if not self.content:
             return set()
             
-        date_matches = self.date_pattern.findall(self.content)
         normalized_dates = set()
-        
-        for date_str in date_matches:
-            try:
-                # Try to parse and normalize the date
-                if '/' in date_str:
-                    parts = date_str.split('/')
-                elif '-' in date_str:
-                    parts = date_str.split('-')
-                else:
-                    continue
-                    
-                # Handle different date formats
-                if len(parts) == 3:
-                    if len(parts[2]) == 4:  # MM/DD/YYYY
-                        month, day, year = parts
-                    else:  # YYYY/MM/DD
-                        year, month, day = parts
-                        
-                    # Make sure year is 4 digits
-                    if len(year) == 2:
-                        if int(year) > 50:  # Assume 19xx for years > 50
-                            year = f"19{year}"
-                        else:  # Assume 20xx for years <= 50
-                            year = f"20{year}"
-                            
-                    normalized_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                    normalized_dates.add(normalized_date)
-            except:
-                continue
+        for date_str in self.date_pattern.findall(self.content):
+            normalized_date = self._normalize_date_string(date_str, allow_ambiguous=False)
+            if normalized_date:
+                normalized_dates.add(normalized_date)
                 
         self.extracted_dates = normalized_dates
         return normalized_dates
@@ -214,12 +387,8 @@ class PDFExtractor(BaseExtractor):
             return []
             
         providers = []
-        # Look for common doctor name patterns: Dr. LastName or FirstName LastName, MD
-        dr_pattern = re.compile(r'Dr\.\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
-        md_pattern = re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+),\s+(?:M\.?D\.?|D\.?O\.?)')
-        
-        dr_matches = dr_pattern.findall(self.content)
-        md_matches = md_pattern.findall(self.content)
+        dr_matches = DR_NAME_PATTERN.findall(self.content)
+        md_matches = MD_NAME_PATTERN.findall(self.content)
         
         providers.extend(dr_matches)
         providers.extend(md_matches)
@@ -231,25 +400,11 @@ class PDFExtractor(BaseExtractor):
         if not self.content:
             return "unknown"
         
-        content_lower = self.content.lower()
-        
         # Look for specific markers in the text
-        if "lab" in content_lower and "result" in content_lower:
-            return "lab_report"
-        elif "radiology" in content_lower or "imaging" in content_lower or "x-ray" in content_lower:
-            return "imaging_report"
-        elif "assessment" in content_lower and "plan" in content_lower:
-            return "clinical_note"
-        elif "prescription" in content_lower or "rx" in content_lower:
-            return "prescription"
-        elif "discharge" in content_lower and "summary" in content_lower:
-            return "discharge_summary"
-        elif "referral" in content_lower:
-            return "referral"
-        elif "progress" in content_lower and "note" in content_lower:
-            return "progress_note"
-        elif "history" in content_lower and "physical" in content_lower:
-            return "history_physical"
+        for doc_type, require_all, patterns in DOCUMENT_TYPE_RULES:
+            check = all if require_all else any
+            if check(pattern.search(self.content) for pattern in patterns):
+                return doc_type
         
         # Default to general medical document
         return "medical_document"
@@ -274,12 +429,10 @@ class PDFExtractor(BaseExtractor):
         if not self.page_texts or start_page < 0 or end_page >= len(self.page_texts):
             return ""
         
-        result = ""
-        for i in range(start_page, end_page + 1):
-            if i < len(self.page_texts):
-                result += f"\n--- Page {i+1} ---\n{self.page_texts[i]}"
-        
-        return result
+        return "".join(
+            f"\n--- Page {i+1} ---\n{self.page_texts[i]}"
+            for i in range(start_page, end_page + 1)
+        )
     
     def detect_medical_terms(self) -> Dict[str, int]:
         """Detect common medical terms and their frequencies in the document."""
@@ -289,6 +442,18 @@ class PDFExtractor(BaseExtractor):
         term_counts = {}
         content_lower = self.content.lower()
         
+        if ahocorasick is not None:
+            # Single pass over the document for all terms. Occurrences of the same
+            # term are counted without overlap, matching str.count.
+            automaton = _build_term_automaton(frozenset(self.medical_terms))
+            next_allowed = {}
+            for end, (length, term) in automaton.iter(content_lower):
+                start = end - length + 1
+                if start >= next_allowed.get(term, 0):
+                    term_counts[term] = term_counts.get(term, 0) + 1
+                    next_allowed[term] = end + 1
+            return term_counts
+        
         for term in self.medical_terms:
             count = content_lower.count(term)
             if count > 0:
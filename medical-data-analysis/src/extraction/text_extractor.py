@@ -1,10 +1,15 @@
+import os
 import re
+import mmap
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Any, Union
 
 from src.extraction.base import BaseExtractor
 
+# Files at or above this size are memory-mapped rather than read into a buffer
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
 
 class TextExtractor(BaseExtractor):
     """Extractor for plain text files including notes, narratives, and symptoms."""
@@ -72,6 +77,12 @@ class TextExtractor(BaseExtractor):
                 "psychiatric", "therapy", "counseling", "psychological", "panic attack"
             ]
         }
+        
+        # Lowercased keywords, computed once and shared by every content scan
+        self.specialty_keywords_lower = {
+            specialty: tuple(keyword.lower() for keyword in keywords)
+            for specialty, keywords in self.medical_specialties.items()
+        }
     
     def extract(self, file_path: Union[str, Path]) -> Dict[str, Any]:
         """
@@ -104,74 +115,66 @@ class TextExtractor(BaseExtractor):
         """
         Extract content from a text file.
         
+        The file is read once as bytes and decoded in memory, so encoding
+        fallbacks don't re-open the file. Large files are memory-mapped
+        instead of copied into a read buffer.
+        
         Returns:
             Text content of the file
         """
         try:
-            with open(self.source_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                self.confidence_score = 1.0
-                return content
+            with open(self.source_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                        return self._decode_content(buf)
+                return self._decode_content(f.read())
+        except Exception as e:
+            self.confidence_score = 0.0
+            return f"ERROR: Could not extract text content: {str(e)}"
+    
+    def _decode_content(self, raw) -> str:
+        """
+        Decode raw file bytes, falling back through common encodings.
+        
+        Args:
+            raw: Bytes-like object holding the file contents
+            
+        Returns:
+            Decoded text with newlines normalized as in text mode
+        """
+        try:
+            content = str(raw, 'utf-8')
+            self.confidence_score = 1.0
         except UnicodeDecodeError:
+            content = None
             # Try alternative encodings
-            encodings = ['latin-1', 'cp1252', 'iso-8859-1']
-            for encoding in encodings:
+            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
                 try:
-                    with open(self.source_file, 'r', encoding=encoding) as f:
-                        content = f.read()
-                        self.confidence_score = 0.8  # Reduced confidence for fallback encoding
-                        return content
-                except Exception:
+                    content = str(raw, encoding)
+                    self.confidence_score = 0.8  # Reduced confidence for fallback encoding
+                    break
+                except UnicodeDecodeError:
                     continue
             
-            # If all else fails, try binary mode and decode with errors ignored
-            try:
-                with open(self.source_file, 'rb') as f:
-                    content = f.read().decode('utf-8', errors='replace')
-                    self.confidence_score = 0.5  # Low confidence due to character replacement
-                    return content
-            except Exception as e:
-                self.confidence_score = 0.0
-                return f"ERROR: Could not extract text content: {str(e)}"
+            if content is None:
+                # If all else fails, decode with replacement characters
+                content = str(raw, 'utf-8', errors='replace')
+                self.confidence_score = 0.5  # Low confidence due to character replacement
+        
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
     
     def extract_dates(self) -> Set[str]:
         """Extract all dates mentioned in the text content."""
         if not self.content:
             return set()
             
-        date_matches = self.date_pattern.findall(self.content)
         normalized_dates = set()
-        
-        for date_str in date_matches:
-            try:
-                # Try to parse and normalize the date
-                if '/' in date_str:
-                    parts = date_str.split('/')
-                elif '-' in date_str:
-                    parts = date_str.split('-')
-                else:
-                    continue
-                    
-                # Handle different date formats
-                if len(parts) == 3:
-                    if len(parts[2]) == 4:  # MM/DD/YYYY
-                        month, day, year = parts
-                    elif len(parts[0]) == 4:  # YYYY/MM/DD
-                        year, month, day = parts
-                    else:
-                        continue
-                        
-                    # Make sure year is 4 digits
-                    if len(year) == 2:
-                        if int(year) > 50:  # Assume 19xx for years > 50
-                            year = f"19{year}"
-                        else:  # Assume 20xx for years <= 50
-                            year = f"20{year}"
-                            
-                    normalized_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                    normalized_dates.add(normalized_date)
-            except:
-                continue
+        for date_str in self.date_pattern.findall(self.content):
+            normalized_date = self._normalize_date_string(date_str, allow_ambiguous=False)
+            if normalized_date:
+                normalized_dates.add(normalized_date)
                 
         self.extracted_dates = normalized_dates
         return normalized_dates
@@ -275,9 +278,9 @@ class TextExtractor(BaseExtractor):
             context = self.content[start_context:end_context].lower()
             
             specialty = None
-            for spec, keywords in self.medical_specialties.items():
+            for spec, keywords in self.specialty_keywords_lower.items():
                 for keyword in keywords:
-                    if keyword.lower() in context:
+                    if keyword in context:
                         specialty = spec
                         break
                 if specialty:
@@ -305,9 +308,9 @@ class TextExtractor(BaseExtractor):
             context = self.content[start_context:end_context].lower()
             
             specialty = None
-            for spec, keywords in self.medical_specialties.items():
+            for spec, keywords in self.specialty_keywords_lower.items():
                 for keyword in keywords:
-                    if keyword.lower() in context:
+                    if keyword in context:
                         specialty = spec
                         break
                 if specialty:
@@ -352,8 +355,13 @@ class TextExtractor(BaseExtractor):
         
         return sections
     
-    def extract_doctor_notes(self) -> List[Dict[str, Any]]:
-        """Extract clinical information including doctor notes, observations, and medical findings."""
+    def extract_doctor_notes(self, sections: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Extract clinical information including doctor notes, observations, and medical findings.
+        
+        Args:
+            sections: Clinical sections already extracted from the content, if available
+        """
         if not self.content:
             return []
         
@@ -410,7 +418,8 @@ class TextExtractor(BaseExtractor):
             })
         
         # Extract all clinical sections for comprehensive medical data
-        sections = self.extract_clinical_sections()
+        if sections is None:
+            sections = self.extract_clinical_sections()
         important_sections = [
             "ASSESSMENT", "IMPRESSION", "PLAN", "DIAGNOSIS", "HISTORY", 
             "PHYSICAL EXAMINATION", "FINDINGS", "RECOMMENDATIONS", 
@@ -444,9 +453,9 @@ class TextExtractor(BaseExtractor):
         specialty_counts = {specialty: 0 for specialty in self.medical_specialties}
         content_lower = self.content.lower()
         
-        for specialty, keywords in self.medical_specialties.items():
+        for specialty, keywords in self.specialty_keywords_lower.items():
             for keyword in keywords:
-                specialty_counts[specialty] += content_lower.count(keyword.lower())
+                specialty_counts[specialty] += content_lower.count(keyword)
                 
         # Remove specialties with zero mentions
         return {k: v for k, v in specialty_counts.items() if v > 0}
@@ -459,15 +468,19 @@ class TextExtractor(BaseExtractor):
         if not self.content:
             return events
             
+        # Every event shares the same source string; build it once
+        source = str(self.source_file)
+        
         lines = self.content.split('\n')
         for line_num, line in enumerate(lines):
-            date_matches = self.date_pattern.findall(line)
-            if date_matches:
+            date_match = self.date_pattern.search(line)
+            if date_match:
                 # Check if line contains medical terms
                 medical_relevance = False
-                for specialty, terms in self.medical_specialties.items():
+                line_lower = line.lower()
+                for specialty, terms in self.specialty_keywords_lower.items():
                     for term in terms:
-                        if term.lower() in line.lower():
+                        if term in line_lower:
                             medical_relevance = True
                             break
                     if medical_relevance:
@@ -476,9 +489,9 @@ class TextExtractor(BaseExtractor):
                 if medical_relevance:
                     events.append({
                         "line_number": line_num + 1,
-                        "date": date_matches[0],
+                        "date": date_match.group(1),
                         "text": line.strip(),
-                        "source": str(self.source_file)
+                        "source": source
                     })
                     
         return events
@@ -504,6 +517,9 @@ class TextExtractor(BaseExtractor):
         self.content = self._extract_content()
         self.metadata = self._extract_metadata()
         
+        # Sections feed both the output and the doctor-note pass; scan once
+        clinical_sections = self.extract_clinical_sections()
+        
         extracted_data = {
             "metadata": self.metadata,
             "content": self.content,
@@ -513,8 +529,8 @@ class TextExtractor(BaseExtractor):
             "providers": self.extract_providers(),
             "specialties": self.identify_medical_specialties(),
             "medical_events": self.extract_medical_events(),
-            "clinical_sections": self.extract_clinical_sections(),
-            "doctor_notes": self.extract_doctor_notes()
+            "clinical_sections": clinical_sections,
+            "doctor_notes": self.extract_doctor_notes(clinical_sections)
         }
         
         return extracted_data 
\ No newline at end of file
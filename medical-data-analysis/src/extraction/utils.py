@@ -3,8 +3,9 @@ Utility functions for the extraction module.
 """
 
 import os
+import re
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Iterator, Optional, Iterable
 
 # List of supported file extensions
 SUPPORTED_EXTENSIONS = [
@@ -22,8 +23,37 @@ def is_supported_file_type(file_path: Union[str, Path]) -> bool:
     Returns:
         True if the file is of a supported type, False otherwise
     """
-    file_path = Path(file_path)
-    return file_path.suffix.lower() in SUPPORTED_EXTENSIONS
+    return get_file_extension(file_path) in SUPPORTED_EXTENSIONS
+
+def iter_files(directory: Union[str, Path],
+               extensions: Optional[Iterable[str]] = None) -> Iterator[Path]:
+    """
+    Recursively yield files under a directory in a single pass.
+    
+    Uses os.scandir so each directory is listed once and the file/dir check
+    comes from the cached dirent type instead of an extra stat per entry.
+    
+    Args:
+        directory: Root directory to walk
+        extensions: Optional lowercase extensions (with dot) to filter on
+        
+    Returns:
+        Iterator of file paths
+    """
+    wanted = frozenset(extensions) if extensions is not None else None
+    stack = [os.fspath(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        if wanted is None or os.path.splitext(entry.name)[1].lower() in wanted:
+                            yield Path(entry.path)
+        except OSError:
+            continue
 
 def get_file_extension(file_path: Union[str, Path]) -> str:
     """
@@ -35,8 +65,30 @@ def get_file_extension(file_path: Union[str, Path]) -> str:
     Returns:
         File extension (lowercase, with dot)
     """
-    file_path = Path(file_path)
-    return file_path.suffix.lower()
+    # splitext on the raw string avoids building a Path object per call
+    return os.path.splitext(os.fspath(file_path))[1].lower()
+
+# Path keywords for each document type, in priority order
+PATH_DOCUMENT_TYPE_KEYWORDS = (
+    ("lab_result", ("lab", "test")),
+    ("clinical_note", ("note", "clinical", "doctor")),
+    ("imaging", ("xray", "x-ray", "mri", "ct")),
+    ("patient_history", ("history", "story")),
+    ("medical_timeline", ("timeline",)),
+    ("symptom_tracker", ("symptom",)),
+)
+
+# One zero-width alternation with a named group per document type. The lookahead
+# lets finditer report overlapping keywords, so a single scan sees every hit.
+_PATH_DOCUMENT_TYPE_PATTERN = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{doc_type}>{'|'.join(re.escape(k) for k in keywords)})"
+        for doc_type, keywords in PATH_DOCUMENT_TYPE_KEYWORDS
+    ) + ")"
+)
+_PATH_DOCUMENT_TYPE_PRIORITY = {
+    doc_type: rank for rank, (doc_type, _) in enumerate(PATH_DOCUMENT_TYPE_KEYWORDS)
+}
 
 def get_document_type_from_path(file_path: Union[str, Path]) -> str:
     """
@@ -50,29 +102,14 @@ def get_document_type_from_path(file_path: Union[str, Path]) -> str:
     """
     file_path = str(file_path).lower()
     
-    # Check for lab results
-    if "lab" in file_path or "test" in file_path:
-        return "lab_result"
-    
-    # Check for clinical notes
-    if "note" in file_path or "clinical" in file_path or "doctor" in file_path:
-        return "clinical_note"
-    
-    # Check for imaging results
-    if "xray" in file_path or "x-ray" in file_path or "mri" in file_path or "ct" in file_path:
-        return "imaging"
-    
-    # Check for patient history
-    if "history" in file_path or "story" in file_path:
-        return "patient_history"
-    
-    # Check for timeline
-    if "timeline" in file_path:
-        return "medical_timeline"
-    
-    # Check for symptoms
-    if "symptom" in file_path:
-        return "symptom_tracker"
+    best_type = None
+    best_rank = len(_PATH_DOCUMENT_TYPE_PRIORITY)
+    for match in _PATH_DOCUMENT_TYPE_PATTERN.finditer(file_path):
+        rank = _PATH_DOCUMENT_TYPE_PRIORITY[match.lastgroup]
+        if rank < best_rank:
+            best_type, best_rank = match.lastgroup, rank
+            if rank == 0:
+                break
     
     # Default to general medical document
-    return "medical_document" 
\ No newline at end of file
+    return best_type or "medical_document"
@@ -15,32 +15,43 @@ if FIRESTORE_PROJECT:
 else:
     db = firestore.Client()
 
-def upload_health_events(user_id: str, health_events: List[Dict[str, Any]]) -> int:
+# Firestore caps a single batched write at 500 operations
+BATCH_SIZE = 500
+
+def _batched_set(collection_ref, docs: List[Dict[str, Any]], label: str) -> int:
     """
-    Upload a list of health events to Firestore under users/{userId}/healthEvents.
-    Returns the number of successful uploads.
+    Write documents to a collection using batched commits instead of one
+    request per document. Returns the number of documents written.
     """
     success = 0
-    for event in health_events:
+    for start in range(0, len(docs), BATCH_SIZE):
+        chunk = docs[start:start + BATCH_SIZE]
+        batch = db.batch()
+        for doc in chunk:
+            # Use doc['id'] if present, else auto-generate
+            batch.set(collection_ref.document(doc.get("id") or None), doc)
         try:
-            # Use event['id'] if present, else auto-generate
-            doc_ref = db.collection("users").document(user_id).collection("healthEvents").document(event.get("id") or None)
-            doc_ref.set(event)
-            success += 1
+            batch.commit()
+            success += len(chunk)
         except GoogleAPIError as e:
-            print(f"[Firestore] Failed to upload event: {e}")
+            print(f"[Firestore] Failed to upload {len(chunk)} {label}: {e}")
     return success
 
-def upload_entities(user_id: str, entity_type: str, entities: List[Dict[str, Any]]):
+def upload_health_events(user_id: str, health_events: List[Dict[str, Any]]) -> int:
+    """
+    Upload a list of health events to Firestore under users/{userId}/healthEvents.
+    Returns the number of successful uploads.
+    """
+    collection_ref = db.collection("users").document(user_id).collection("healthEvents")
+    return _batched_set(collection_ref, health_events, "health events")
+
+def upload_entities(user_id: str, entity_type: str, entities: List[Dict[str, Any]]) -> int:
     """
     Generic uploader for other entity types (e.g., medications, symptoms).
+    Returns the number of successful uploads.
     """
-    for entity in entities:
-        try:
-            doc_ref = db.collection("users").document(user_id).collection(entity_type).document(entity.get("id") or None)
-            doc_ref.set(entity)
-        except GoogleAPIError as e:
-            print(f"[Firestore] Failed to upload {entity_type}: {e}")
+    collection_ref = db.collection("users").document(user_id).collection(entity_type)
+    return _batched_set(collection_ref, entities, entity_type)
 
 if __name__ == "__main__":
     # Example CLI usage: python firestore_upload.py <user_id> <json_file>
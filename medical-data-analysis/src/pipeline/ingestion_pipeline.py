@@ -8,16 +8,20 @@ of medical documents from various formats into the structured database.
 
 import os
 import sys
+import copy
+import hashlib
 import logging
 import json
 import numpy as np
 import shutil
 import uuid
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Type, cast
-import glob
 
 # Database imports
 from sqlalchemy.orm import Session
@@ -42,7 +46,13 @@ from src.database.models.entity import (
 )
 from src.ai.vectordb.pipeline_integration import VectorDBPostProcessor, VectorDBIntegration
 from src.ai.entity_standardization import standardize_entities
-from src.extraction.utils import is_supported_file_type
+from src.extraction.utils import is_supported_file_type, iter_files
+
+# orjson serializes processed results (including numpy values) much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add import for Firestore upload utility
 try:
@@ -50,6 +60,15 @@ try:
 except ImportError:
     upload_health_events = None
 
+# File types the pipeline accepts
+PIPELINE_SUPPORTED_EXTENSIONS = frozenset({
+    '.txt', '.csv', '.html', '.htm', '.pdf',
+    '.doc', '.docx', '.rtf', '.md', '.json'
+})
+
+# Most recent analyses kept for reuse on identical text; each holds a full AI result
+ANALYSIS_CACHE_SIZE = 128
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -61,6 +80,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _extract_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Extract the contents of a single file.
+    
+    Extraction is CPU-bound and has no shared state, so this also runs in the
+    worker processes of IngestionPipeline.process_files; AI analysis and database
+    writes stay in the parent.
+    
+    Args:
+        file_path: Path to the file to extract
+        
+    Returns:
+        Dictionary with extracted contents or None if extraction failed
+    """
+    extractor = get_extractor(file_path)
+    if not extractor:
+        logger.warning(f"No suitable extractor found for {file_path}")
+        return None
+        
+    try:
+        # Use process_file method from the BaseExtractor implementation
+        extracted_data = extractor.process_file(file_path)
+        
+        # Convert types for serialization
+        if "extraction_date" in extracted_data and isinstance(extracted_data["extraction_date"], datetime):
+            extracted_data["extraction_date"] = extracted_data["extraction_date"].isoformat()
+        
+        return extracted_data
+    except Exception as e:
+        logger.error(f"Error extracting from file {file_path}: {str(e)}")
+        logger.error(traceback.format_exc())
+        return None
+
+
 class IngestionPipeline:
     """
     Pipeline for ingesting and processing medical documents.
@@ -122,6 +175,9 @@ class IngestionPipeline:
         # Set up post-processors
         self.post_processors: List[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = []
         
+        # AI analysis results keyed by SHA-256 of the analyzed text, least recently used first
+        self._analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
         # Import and initialize AI modules
         self._import_modules()
     
@@ -163,12 +219,15 @@ class IngestionPipeline:
         """
         self.post_processors.append(processor)
     
-    def process_directory(self, directory: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
+    def process_directory(self, directory: Optional[Union[str, Path]] = None,
+                          max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Process all files in a directory.
         
         Args:
             directory: Directory containing files to process (defaults to input_dir)
+            max_workers: Number of worker processes used for extraction; files are
+                         extracted serially when this is None or 1
             
         Returns:
             List of dictionaries with processing results
@@ -184,17 +243,66 @@ class IngestionPipeline:
             return []
         
         # Get all files in directory
-        files = [f for f in directory.glob("**/*") if f.is_file()]
+        files = list(iter_files(directory))
         logger.info(f"Found {len(files)} files")
         
-        # Process each file
-        for file_path in files:
-            result = self.process_file(file_path)
+        for result in self.process_files(files, max_workers=max_workers):
             if result:
                 results.append(result)
         
         return results
     
+    def process_files(self, files: List[Union[str, Path]],
+                      max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process a list of files through the pipeline.
+        
+        Extraction is independent per file, so with max_workers > 1 it runs in a
+        process pool; AI analysis, database storage and saving stay serial.
+        
+        Args:
+            files: Paths of the files to process
+            max_workers: Number of worker processes used for extraction; files are
+                         extracted serially when this is None or 1
+            
+        Returns:
+            List of processing results, one per input file and in the same order
+        """
+        files = [Path(f) for f in files]
+        
+        # Extract supported files in parallel up front if requested
+        extracted = {}
+        if max_workers and max_workers > 1:
+            supported = [f for f in files if f.is_file() and self._is_supported_file_type(f)]
+            if len(supported) > 1:
+                logger.info(f"Extracting {len(supported)} files with {max_workers} worker processes")
+                chunksize = max(1, len(supported) // (max_workers * 4))
+                try:
+                    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                        results = executor.map(_extract_file, supported, chunksize=chunksize)
+                        # Collect as results arrive so a pool failure keeps what finished
+                        for file_path, extracted_data in zip(supported, results):
+                            extracted[file_path] = extracted_data
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. OOM-killed on a huge PDF); files the pool
+                    # never returned are extracted one by one below
+                    logger.error(f"Extraction worker pool broke after {len(extracted)} of "
+                                 f"{len(supported)} files: {str(e)}")
+                except Exception as e:
+                    # e.g. a result that could not be pickled back to the parent
+                    logger.error(f"Parallel extraction failed after {len(extracted)} of "
+                                 f"{len(supported)} files: {str(e)}")
+        
+        # Process each file
+        results = []
+        for file_path in files:
+            if file_path in extracted and extracted[file_path] is None:
+                # The worker already tried and logged why extraction failed
+                results.append({"error": f"Failed to extract text from file: {file_path}"})
+            else:
+                results.append(self.process_file(file_path, extracted_data=extracted.get(file_path)))
+        return results
+    
     def _get_extractor_for_file(self, file_path: Path) -> Optional[BaseExtractor]:
         """
         Get the appropriate extractor for a file.
@@ -210,12 +318,15 @@ class IngestionPipeline:
             logger.warning(f"No suitable extractor found for {file_path}")
         return extractor
         
-    def process_file(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+    def process_file(self, file_path: Union[str, Path],
+                     extracted_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process a single file through the pipeline.
         
         Args:
             file_path: Path to the file to process
+            extracted_data: Extraction results produced ahead of time (e.g. by a
+                            worker process); the file is extracted here if None
             
         Returns:
             Dictionary with processing results
@@ -224,18 +335,18 @@ class IngestionPipeline:
         logger.info(f"Processing file: {file_path}")
         
         try:
-            # Check if file exists and is a file
-            if not file_path.exists():
-                return {"error": f"File not found: {file_path}"}
+            # Check if file exists and is a file (one stat on the common path)
             if not file_path.is_file():
+                if not file_path.exists():
+                    return {"error": f"File not found: {file_path}"}
                 return {"error": f"Not a file: {file_path}"}
                 
             # Check if the file is of a supported type
             if not self._is_supported_file_type(file_path):
                 return {"error": f"Unsupported file type: {file_path}"}
             
-            # Extract text from file
-            processed_data = self._process_file(file_path)
+            # Extract text from file unless it was already extracted
+            processed_data = extracted_data if extracted_data is not None else self._process_file(file_path)
             if processed_data is None:
                 return {"error": f"Failed to extract text from file: {file_path}"}
             
@@ -336,23 +447,7 @@ class IngestionPipeline:
         Returns:
             Dictionary with extracted contents or None if extraction failed
         """
-        extractor = self._get_extractor_for_file(file_path)
-        if not extractor:
-            return None
-            
-        try:
-            # Use process_file method from the BaseExtractor implementation
-            extracted_data = extractor.process_file(file_path)
-            
-            # Convert types for serialization
-            if "extraction_date" in extracted_data and isinstance(extracted_data["extraction_date"], datetime):
-                extracted_data["extraction_date"] = extracted_data["extraction_date"].isoformat()
-            
-            return extracted_data
-        except Exception as e:
-            logger.error(f"Error extracting from file {file_path}: {str(e)}")
-            logger.error(traceback.format_exc())
-            return None
+        return _extract_file(file_path)
     
     def _analyze_document(self, text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -370,6 +465,14 @@ class IngestionPipeline:
         if self.model_integration is None:
             logger.warning("No model integration available for document analysis")
             return result
+        
+        # Identical text (e.g. the same report exported twice) is only analyzed once
+        text_hash = hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+        cached = self._analysis_cache.get(text_hash)
+        if cached is not None:
+            logger.info("Reusing cached analysis for identical document text")
+            self._analysis_cache.move_to_end(text_hash)
+            return copy.deepcopy(cached)
             
         try:
             # Extract entities from text
@@ -387,6 +490,9 @@ class IngestionPipeline:
                     result["embeddings"]["document"] = embedding
             
             logger.info("Document analysis completed successfully")
+            self._analysis_cache[text_hash] = copy.deepcopy(result)
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
             return result
             
         except Exception as e:
@@ -410,13 +516,14 @@ class IngestionPipeline:
         
         try:
             # Create document record
+            metadata = processed_data.get("metadata", {})
             processed_data["document"] = Document(
-                document_type=processed_data.get("metadata", {}).get("document_type", "unknown"),
+                document_type=metadata.get("document_type", "unknown"),
                 content=processed_data.get("content", ""),
                 patient_id=1,  # Default to patient ID 1 for now, would be determined in production
-                provider_id=processed_data.get("metadata", {}).get("provider_id"),
-                document_date=processed_data.get("metadata", {}).get("document_date"),
-                source=processed_data.get("metadata", {}).get("source", "unknown")
+                provider_id=metadata.get("provider_id"),
+                document_date=metadata.get("document_date"),
+                source=metadata.get("source", "unknown")
             )
             self.document_dao.create(processed_data["document"])
             
@@ -454,15 +561,33 @@ class IngestionPipeline:
                 "ai_analysis": self._make_json_serializable(ai_result)
             }
             
-            # Save to file
-            with open(result_filename, 'w', encoding='utf-8') as f:
+            # Serialize in memory first: json.dump issues one small write per
+            # token, while a single write of the encoded document is buffered once
+            serialized = None
+            if orjson is not None:
+                try:
+                    serialized = orjson.dumps(
+                        serializable_data,
+                        default=self._json_serialize_handler,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    )
+                except orjson.JSONEncodeError:
+                    # e.g. integers wider than 64 bits; the json module handles those
+                    serialized = None
+            
+            if serialized is None:
                 try:
                     # Get the NumpyEncoder if available
                     from src.ai.vectordb.numpy_json import NumpyEncoder
-                    json.dump(serializable_data, f, cls=NumpyEncoder, indent=2)
+                    serialized = json.dumps(serializable_data, cls=NumpyEncoder, indent=2)
                 except ImportError:
                     # Fall back to default encoder with custom handling
-                    json.dump(serializable_data, f, default=self._json_serialize_handler, indent=2)
+                    serialized = json.dumps(serializable_data, default=self._json_serialize_handler, indent=2)
+                serialized = serialized.encode('utf-8')
+            
+            # Save to file
+            with open(result_filename, 'wb') as f:
+                f.write(serialized)
             
             logger.info(f"Saved processed results to {result_filename}")
             return result_filename
@@ -532,11 +657,7 @@ class IngestionPipeline:
         Returns:
             True if the file is of a supported type, False otherwise
         """
-        supported_extensions = [
-            '.txt', '.csv', '.html', '.htm', '.pdf', 
-            '.doc', '.docx', '.rtf', '.md', '.json'
-        ]
-        return file_path.suffix.lower() in supported_extensions
+        return file_path.suffix.lower() in PIPELINE_SUPPORTED_EXTENSIONS
     
     def register_vector_db(self, vector_db_path: Union[str, Path] = "data/vector_db"):
         """
@@ -602,6 +723,7 @@ def main():
     parser.add_argument("--no-db", action="store_true", help="Don't store results in database")
     parser.add_argument("--output", "-o", default="processed_data", help="Directory to store processed results")
     parser.add_argument("--use-gpu", action="store_true", help="Use GPU for model inference if available")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes for parallel extraction of a directory")
     
     args = parser.parse_args()
     
@@ -620,7 +742,7 @@ def main():
                 logger.error(f"Error processing file: {result['error']}")
                 return 1
         elif input_path.is_dir():
-            results = pipeline.process_directory(input_path)
+            results = pipeline.process_directory(input_path, max_workers=args.workers)
             errors = [r for r in results if "error" in r]
             if errors:
                 logger.error(f"Encountered {len(errors)} errors during processing")
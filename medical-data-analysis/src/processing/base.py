@@ -2,7 +2,48 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Set
 import logging
 import re
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
+
+# Common date format patterns, tried in order when normalizing dates
+DATE_FORMATS = (
+    '%Y-%m-%d',       # 2023-01-15
+    '%m/%d/%Y',       # 01/15/2023
+    '%d/%m/%Y',       # 15/01/2023
+    '%m-%d-%Y',       # 01-15-2023
+    '%d-%m-%Y',       # 15-01-2023
+    '%Y/%m/%d',       # 2023/01/15
+    '%b %d, %Y',      # Jan 15, 2023
+    '%d %b %Y',       # 15 Jan 2023
+    '%B %d, %Y',      # January 15, 2023
+    '%d %B %Y',       # 15 January 2023
+    '%m/%d/%y',       # 01/15/23
+    '%d/%m/%y',       # 15/01/23
+)
+
+# Runs of word characters, as delimited by \b in the keyword patterns
+WORD_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """Parse a date string against DATE_FORMATS, caching results since the same dates recur across documents."""
+    # Fast path: most extracted dates are already YYYY-MM-DD
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    
+    return None
+
 
 class BaseProcessor(ABC):
     """Base abstract class for data processors that clean and normalize extracted medical data."""
@@ -12,20 +53,7 @@ class BaseProcessor(ABC):
         self.data = {}
         
         # Common date format patterns
-        self.date_formats = [
-            '%Y-%m-%d',       # 2023-01-15
-            '%m/%d/%Y',       # 01/15/2023
-            '%d/%m/%Y',       # 15/01/2023
-            '%m-%d-%Y',       # 01-15-2023
-            '%d-%m-%Y',       # 15-01-2023
-            '%Y/%m/%d',       # 2023/01/15
-            '%b %d, %Y',      # Jan 15, 2023
-            '%d %b %Y',       # 15 Jan 2023
-            '%B %d, %Y',      # January 15, 2023
-            '%d %B %Y',       # 15 January 2023
-            '%m/%d/%y',       # 01/15/23
-            '%d/%m/%y',       # 15/01/23
-        ]
+        self.date_formats = DATE_FORMATS
         
         # Patterns for medical specialties and departments
         self.specialties = {
@@ -97,19 +125,18 @@ class BaseProcessor(ABC):
         normalized_dates = []
         
         for date_str in date_strings:
-            for fmt in self.date_formats:
-                try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    normalized_dates.append({
-                        "original": date_str,
-                        "iso_date": date_obj.strftime("%Y-%m-%d"),
-                        "year": date_obj.year,
-                        "month": date_obj.month,
-                        "day": date_obj.day
-                    })
-                    break  # If successful, no need to try other formats
-                except ValueError:
-                    continue
+            if not date_str:
+                continue
+            
+            date_obj = _parse_date(date_str)
+            if date_obj is not None:
+                normalized_dates.append({
+                    "original": date_str,
+                    "iso_date": date_obj.strftime("%Y-%m-%d"),
+                    "year": date_obj.year,
+                    "month": date_obj.month,
+                    "day": date_obj.day
+                })
                     
         return normalized_dates
     
@@ -126,10 +153,17 @@ class BaseProcessor(ABC):
         text = text.lower()
         specialty_scores = {}
         
+        # Count each word once so single-word keywords are a hash lookup
+        # instead of a full regex scan of the text per keyword
+        word_counts = Counter(WORD_PATTERN.findall(text))
+        
         for specialty, keywords in self.specialties.items():
             matches = 0
             for keyword in keywords:
-                matches += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+                if WORD_PATTERN.fullmatch(keyword):
+                    matches += word_counts[keyword]
+                else:
+                    matches += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
             
             if matches > 0:
                 confidence = min(matches / len(keywords) * 0.5, 1.0)  # Scale confidence
@@ -4,6 +4,23 @@ from src.processing.base import BaseProcessor
 from src.processing.medical_text_processor import MedicalTextProcessor
 from src.processing.lab_results_processor import LabResultsProcessor
 
+# Processor class for each document type; only the selected one is instantiated
+PROCESSOR_CLASSES = {
+    "lab_result": LabResultsProcessor,
+    "lab_report": LabResultsProcessor,
+    "medical_note": MedicalTextProcessor,
+    "clinical_note": MedicalTextProcessor,
+    "doctor_letter": MedicalTextProcessor,
+    "medical_history": MedicalTextProcessor,
+    "discharge_summary": MedicalTextProcessor,
+    "consultation": MedicalTextProcessor,
+    "assessment": MedicalTextProcessor,
+    "referral": MedicalTextProcessor,
+    "imaging_report": MedicalTextProcessor,
+    "test_result": LabResultsProcessor,
+    "patient_narrative": MedicalTextProcessor,
+}
+
 
 class ProcessorFactory:
     """Factory class for creating and managing processors."""
@@ -19,22 +36,6 @@ class ProcessorFactory:
         Returns:
             An instance of the appropriate processor
         """
-        processors = {
-            "lab_result": LabResultsProcessor(),
-            "lab_report": LabResultsProcessor(),
-            "medical_note": MedicalTextProcessor(),
-            "clinical_note": MedicalTextProcessor(),
-            "doctor_letter": MedicalTextProcessor(),
-            "medical_history": MedicalTextProcessor(),
-            "discharge_summary": MedicalTextProcessor(),
-            "consultation": MedicalTextProcessor(),
-            "assessment": MedicalTextProcessor(),
-            "referral": MedicalTextProcessor(),
-            "imaging_report": MedicalTextProcessor(),
-            "test_result": LabResultsProcessor(),
-            "patient_narrative": MedicalTextProcessor(),
-        }
-        
         # Make sure document_type is a string before calling lower()
         if isinstance(document_type, str):
             lookup_key = document_type.lower()
@@ -43,7 +44,7 @@ class ProcessorFactory:
             lookup_key = str(document_type).lower()
         
         # Default to MedicalTextProcessor if no specific processor is found
-        return processors.get(lookup_key, MedicalTextProcessor())
+        return PROCESSOR_CLASSES.get(lookup_key, MedicalTextProcessor)()
     
     @staticmethod
     def determine_document_type(extracted_data: Dict[str, Any]) -> str:
@@ -60,9 +61,13 @@ class ProcessorFactory:
         if "document_type" in extracted_data:
             return extracted_data["document_type"]
         
-        # Get file path from metadata
-        file_path = extracted_data.get("metadata", {}).get("file_path", "")
-        file_name = extracted_data.get("metadata", {}).get("file_name", "")
+        # Documents classified on an earlier pass keep their type; skip the content scan
+        metadata = extracted_data.get("metadata", {})
+        if metadata.get("document_type"):
+            return metadata["document_type"]
+        
+        # Get file name from metadata
+        file_name = metadata.get("file_name", "")
         
         # Look for keywords in the content or file name
         content = extracted_data.get("content", "").lower()
@@ -9,7 +9,6 @@ import re
 import logging
 from typing import Dict, List, Tuple, Any, Optional, Union
 import pandas as pd
-import numpy as np
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -5,6 +5,60 @@ from datetime import datetime
 
 from src.processing.base import BaseProcessor
 
+
+def _compile_headers(headers) -> "re.Pattern":
+    """Compile section header terms into one case-insensitive alternation."""
+    terms = sorted(headers, key=len, reverse=True)
+    return re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
+# Section headers that scope each kind of clinical extraction
+OBSERVATION_HEADERS = frozenset({"PHYSICAL EXAMINATION", "PHYSICAL EXAM", "EXAM", "FINDINGS", "OBSERVATIONS"})
+DIAGNOSIS_HEADERS = frozenset({"ASSESSMENT", "IMPRESSION", "DIAGNOSIS", "DIAGNOSES"})
+PLAN_HEADERS = frozenset({"PLAN", "TREATMENT PLAN", "RECOMMENDATIONS", "FOLLOW-UP"})
+MEDICATION_HEADERS = frozenset({"MEDICATIONS", "CURRENT MEDICATIONS", "PRESCRIPTIONS"})
+
+_OBSERVATION_HEADER_RE = _compile_headers(OBSERVATION_HEADERS)
+_DIAGNOSIS_HEADER_RE = _compile_headers(DIAGNOSIS_HEADERS)
+_PLAN_HEADER_RE = _compile_headers(PLAN_HEADERS)
+_MEDICATION_HEADER_RE = _compile_headers(MEDICATION_HEADERS)
+
+# Patterns used when splitting section content into items
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.\n]')
+NUMBERED_ITEM_PATTERN = re.compile(r'(?m)^\s*(\d+\.|\d+\)|\d+:)\s*(.+)$')
+LIST_ITEM_PATTERN = re.compile(r'(?m)^\s*(?:\d+\.|\d+\)|\d+:|\*|\-)\s*(.+)$')
+LIST_MEDICATION_PATTERN = re.compile(
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(\d+\.?\d*)\s*(mg|mcg|g|ml|%)', re.IGNORECASE
+)
+
+# Plan item keywords for each category, in priority order
+PLAN_ITEM_CATEGORIES = (
+    ("testing", ("lab", "test", "mri", "ct", "scan", "blood", "panel", "x-ray")),
+    ("referral", ("refer", "referral", "specialist", "consult", "consultation")),
+    ("follow_up", ("follow", "return", "schedule", "appointment", "weeks", "months")),
+    ("medication", ("medic", "prescription", "dose", "mg", "treatment")),
+    ("therapy", ("therapy", "pt", "ot", "physical therapy", "occupational therapy")),
+    ("lifestyle", ("diet", "exercise", "activity", "lifestyle")),
+)
+
+# One zero-width alternation with a named group per category, so a single
+# finditer sees every keyword occurrence (including overlapping ones)
+_PLAN_ITEM_PATTERN = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(re.escape(k) for k in keywords)})"
+        for category, keywords in PLAN_ITEM_CATEGORIES
+    ) + ")"
+)
+_PLAN_ITEM_PRIORITY = {
+    category: rank for rank, (category, _) in enumerate(PLAN_ITEM_CATEGORIES)
+}
+
+
+def _is_relevant_section(section_name: str, headers: frozenset, header_re: "re.Pattern") -> bool:
+    """Check whether a section name is, or contains, one of the given headers."""
+    return section_name in headers or header_re.search(section_name) is not None
+
+
 class MedicalTextProcessor(BaseProcessor):
     """Processor for medical text data with specialized medical entity extraction."""
     
@@ -237,12 +291,10 @@ class MedicalTextProcessor(BaseProcessor):
         observations = []
         
         # Look for observations in physical examination and other relevant sections
-        relevant_sections = ["PHYSICAL EXAMINATION", "PHYSICAL EXAM", "EXAM", "FINDINGS", "OBSERVATIONS"]
-        
         for section_name, section_content in sections.items():
-            if any(rel.upper() in section_name.upper() for rel in relevant_sections):
+            if _is_relevant_section(section_name, OBSERVATION_HEADERS, _OBSERVATION_HEADER_RE):
                 # Split section into lines/sentences
-                lines = re.split(r'[.\n]', section_content)
+                lines = SENTENCE_SPLIT_PATTERN.split(section_content)
                 for line in lines:
                     line = line.strip()
                     if not line:
@@ -300,12 +352,10 @@ class MedicalTextProcessor(BaseProcessor):
         diagnoses = []
         
         # Look for diagnoses in assessment and impression sections
-        relevant_sections = ["ASSESSMENT", "IMPRESSION", "DIAGNOSIS", "DIAGNOSES"]
-        
         for section_name, section_content in sections.items():
-            if any(rel.upper() in section_name.upper() for rel in relevant_sections):
+            if _is_relevant_section(section_name, DIAGNOSIS_HEADERS, _DIAGNOSIS_HEADER_RE):
                 # Look for numbered lists which often indicate diagnoses
-                numbered_items = re.findall(r'(?m)^\s*(\d+\.|\d+\)|\d+:)\s*(.+)$', section_content)
+                numbered_items = NUMBERED_ITEM_PATTERN.findall(section_content)
                 
                 if numbered_items:
                     for _, item in numbered_items:
@@ -316,7 +366,7 @@ class MedicalTextProcessor(BaseProcessor):
                         })
                 else:
                     # Split by lines/sentences
-                    lines = re.split(r'[.\n]', section_content)
+                    lines = SENTENCE_SPLIT_PATTERN.split(section_content)
                     for line in lines:
                         line = line.strip()
                         if line and len(line) > 5:  # Arbitrary minimum to avoid fragments
@@ -333,12 +383,10 @@ class MedicalTextProcessor(BaseProcessor):
         plan_items = []
         
         # Look for plan items in plan section
-        relevant_sections = ["PLAN", "TREATMENT PLAN", "RECOMMENDATIONS", "FOLLOW-UP"]
-        
         for section_name, section_content in sections.items():
-            if any(rel.upper() in section_name.upper() for rel in relevant_sections):
+            if _is_relevant_section(section_name, PLAN_HEADERS, _PLAN_HEADER_RE):
                 # Look for numbered or bulleted lists
-                list_items = re.findall(r'(?m)^\s*(?:\d+\.|\d+\)|\d+:|\*|\-)\s*(.+)$', section_content)
+                list_items = LIST_ITEM_PATTERN.findall(section_content)
                 
                 if list_items:
                     for item in list_items:
@@ -350,7 +398,7 @@ class MedicalTextProcessor(BaseProcessor):
                         })
                 else:
                     # Split by lines/sentences
-                    lines = re.split(r'[.\n]', section_content)
+                    lines = SENTENCE_SPLIT_PATTERN.split(section_content)
                     for line in lines:
                         line = line.strip()
                         if line and len(line) > 5:  # Arbitrary minimum to avoid fragments
@@ -366,55 +414,56 @@ class MedicalTextProcessor(BaseProcessor):
         """Categorize treatment plan items by type."""
         plan_lower = plan_item.lower()
         
-        # Categorize based on content
-        if any(term in plan_lower for term in ["lab", "test", "mri", "ct", "scan", "blood", "panel", "x-ray"]):
-            return "testing"
-        elif any(term in plan_lower for term in ["refer", "referral", "specialist", "consult", "consultation"]):
-            return "referral"
-        elif any(term in plan_lower for term in ["follow", "return", "schedule", "appointment", "weeks", "months"]):
-            return "follow_up"
-        elif any(term in plan_lower for term in ["medic", "prescription", "dose", "mg", "treatment"]):
-            return "medication"
-        elif any(term in plan_lower for term in ["therapy", "pt", "ot", "physical therapy", "occupational therapy"]):
-            return "therapy"
-        elif any(term in plan_lower for term in ["diet", "exercise", "activity", "lifestyle"]):
-            return "lifestyle"
-        else:
-            return "other"
+        # Categorize based on content: the highest-priority category with a keyword wins
+        best_category = "other"
+        best_rank = len(_PLAN_ITEM_PRIORITY)
+        for match in _PLAN_ITEM_PATTERN.finditer(plan_lower):
+            rank = _PLAN_ITEM_PRIORITY[match.lastgroup]
+            if rank < best_rank:
+                best_category, best_rank = match.lastgroup, rank
+                if rank == 0:
+                    break
+        
+        return best_category
     
     def _extract_medications(self, content: str, sections: Dict[str, str]) -> List[Dict[str, Any]]:
         """Extract medications from the text."""
         medications = []
+        # Lowercased names found so far, only used to skip list items already matched
+        known_names = set()
         
         # Look for medications in medication section and other sections
-        relevant_sections = ["MEDICATIONS", "CURRENT MEDICATIONS", "PRESCRIPTIONS"]
-        
         for section_name, section_content in sections.items():
-            if any(rel.upper() in section_name.upper() for rel in relevant_sections):
+            if _is_relevant_section(section_name, MEDICATION_HEADERS, _MEDICATION_HEADER_RE):
                 # Look for medication patterns
                 for match in self.medication_pattern.finditer(section_content):
+                    name = match.group(1).strip()
                     medications.append({
-                        "medication": match.group(1).strip(),
+                        "medication": name,
                         "dosage": match.group(3),
                         "unit": match.group(4),
                         "source": section_name
                     })
+                    known_names.add(name.lower())
                 
                 # Also look for list items which might be medications
-                list_items = re.findall(r'(?m)^\s*(?:\d+\.|\d+\)|\d+:|\*|\-)\s*(.+)$', section_content)
+                list_items = LIST_ITEM_PATTERN.findall(section_content)
                 
                 for item in list_items:
+                    item_lower = item.lower()
                     # Check if this item wasn't already matched by the medication pattern
-                    if not any(med["medication"].lower() in item.lower() for med in medications):
+                    if not any(name in item_lower for name in known_names):
                         # Check for common medication words/patterns
-                        med_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(\d+\.?\d*)\s*(mg|mcg|g|ml|%)', item, re.IGNORECASE)
+                        med_match = LIST_MEDICATION_PATTERN.search(item)
                         if med_match:
+                            name = med_match.group(1).strip()
                             medications.append({
-                                "medication": med_match.group(1).strip(),
+                                "medication": name,
                                 "dosage": med_match.group(2),
                                 "unit": med_match.group(3),
                                 "source": section_name
                             })
+                            known_names.add(name.lower())
         
         return medications
     
@@ -466,18 +515,13 @@ class MedicalTextProcessor(BaseProcessor):
         
         # Add key observations
         if processed_data.get("clinical_observations"):
-            # Group observations by category
-            observations_by_category = {}
+            # Keep the first observation seen for each category in one pass
+            first_by_category = {}
             for obs in processed_data["clinical_observations"]:
-                category = obs.get("category", "general")
-                if category not in observations_by_category:
-                    observations_by_category[category] = []
-                observations_by_category[category].append(obs)
+                first_by_category.setdefault(obs.get("category", "general"), obs)
             
             # Add a representative observation from each category
-            for category, observations in observations_by_category.items():
-                if observations:
-                    summary["key_observations"].append(observations[0])
+            summary["key_observations"].extend(first_by_category.values())
         
         return summary
     
@@ -78,18 +78,8 @@ def test_processing_pipeline(file_path, logger):
         
         output_file = output_dir / f"{Path(file_path).stem}_processed.json"
         with open(output_file, 'w') as f:
-            # Handle non-serializable types
-            json_data = {}
-            for key, value in processed_data.items():
-                try:
-                    # Test if value is JSON serializable
-                    json.dumps(value)
-                    json_data[key] = value
-                except (TypeError, OverflowError):
-                    # If not serializable, convert to string representation
-                    json_data[key] = str(value)
-            
-            json.dump(json_data, f, indent=2)
+            # Serialize once; values JSON can't represent fall back to their string form
+            f.write(json.dumps(processed_data, indent=2, default=str))
         
         logger.info(f"Processed data saved to {output_file}")
         
@@ -99,6 +89,15 @@ def test_processing_pipeline(file_path, logger):
         logger.error(traceback.format_exc())
 
 
+def list_sample_files(samples_dir):
+    """List files with an extension in the samples directory using a single scandir pass."""
+    with os.scandir(samples_dir) as entries:
+        return sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and '.' in entry.name
+        )
+
+
 def test_with_sample_files():
     """Test with available sample files in the samples directory."""
     logger = setup_logging()
@@ -108,13 +107,13 @@ def test_with_sample_files():
     samples_dir.mkdir(exist_ok=True)
     
     # Check if we have sample files
-    sample_files = list(samples_dir.glob("*.*"))
+    sample_files = list_sample_files(samples_dir)
     
     if not sample_files:
         # Create some sample files for testing
         logger.info("No sample files found. Creating sample files for testing...")
         create_sample_files(samples_dir)
-        sample_files = list(samples_dir.glob("*.*"))
+        sample_files = list_sample_files(samples_dir)
     
     # Process each sample file
     for file_path in sample_files:
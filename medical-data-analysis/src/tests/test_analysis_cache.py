@@ -0,0 +1,99 @@
+import sys
+import os
+import types
+import unittest
+import tempfile
+import shutil
+import importlib
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+
+def _stub_missing_module(name, **attrs):
+    """Register a placeholder for a module the pipeline imports but that is unavailable."""
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+# The pipeline imports the whole AI package; these tests mock the models, so
+# placeholders are enough where a module (or transformers) is not installed
+_stub_missing_module("transformers", logging=types.SimpleNamespace(set_verbosity_error=lambda: None))
+_stub_missing_module("src.ai.rag", MedicalRAG=object)
+_stub_missing_module("src.ai.vectordb")
+_stub_missing_module("src.ai.vectordb.pipeline_integration",
+                     VectorDBPostProcessor=object, VectorDBIntegration=object)
+
+from src.pipeline.ingestion_pipeline import IngestionPipeline
+
+class TestAnalysisCache(unittest.TestCase):
+    """Test the pipeline's cache of AI analysis results."""
+
+    def setUp(self):
+        """Set up a pipeline with mocked model integration."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.pipeline = IngestionPipeline(
+            input_dir=self.test_dir / "input",
+            output_dir=self.test_dir / "output",
+            processed_dir=self.test_dir / "processed",
+            models_dir=self.test_dir / "models"
+        )
+        self.pipeline.model_integration = MagicMock()
+        self.model = self.pipeline.model_integration
+
+    def test_repeated_text_returns_independent_copies(self):
+        """Test that repeated text reuses the cached analysis without sharing it."""
+        self.model.extract_entities.return_value = [{"text": "hEDS", "type": "CONDITION"}]
+        self.model.analyze_text.return_value = {"summary": "hypermobile EDS"}
+        self.model.generate_embedding.return_value = [0.1, 0.2, 0.3]
+
+        text = "Patient presents with symptoms consistent with hypermobile EDS."
+        first = self.pipeline._analyze_document(text, {})
+        second = self.pipeline._analyze_document(text, {})
+
+        # Same analysis, but a separate object the caller can modify
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        second["entities"].append({"text": "POTS", "type": "CONDITION"})
+        second["embeddings"]["document"][0] = 9.9
+        self.assertEqual(1, len(first["entities"]))
+        self.assertEqual(first, self.pipeline._analyze_document(text, {}))
+        self.model.extract_entities.assert_called_once()
+
+    @patch("src.pipeline.ingestion_pipeline.ANALYSIS_CACHE_SIZE", 2)
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache stays within its size limit, dropping the oldest use first."""
+        self.model.extract_entities.return_value = []
+        self.model.analyze_text.return_value = {}
+        self.model.generate_embedding.return_value = None
+
+        self.pipeline._analyze_document("first note", {})
+        self.pipeline._analyze_document("second note", {})
+        self.pipeline._analyze_document("first note", {})
+        self.pipeline._analyze_document("third note", {})
+        self.assertEqual(2, len(self.pipeline._analysis_cache))
+        self.assertEqual(3, self.model.extract_entities.call_count)
+
+        # "second note" was least recently used, so it has to be analyzed again
+        self.pipeline._analyze_document("second note", {})
+        self.assertEqual(4, self.model.extract_entities.call_count)
+        self.pipeline._analyze_document("third note", {})
+        self.assertEqual(4, self.model.extract_entities.call_count)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.pipeline.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -156,6 +156,19 @@ Rheumatology
         self.assertIn("referral", plan_types)
         self.assertIn("follow_up", plan_types)
 
+    def test_medication_dose_changes_are_kept(self):
+        """Test that the same medication at different doses is not collapsed."""
+        processor = MedicalTextProcessor()
+        sections = {
+            "MEDICATIONS": "Ibuprofen 400 mg",
+            "CURRENT MEDICATIONS": "Ibuprofen 800 mg",
+        }
+        
+        medications = processor._extract_medications("", sections)
+        
+        doses = [(m["medication"], m["dosage"], m["unit"]) for m in medications]
+        self.assertEqual([("Ibuprofen", "400", "mg"), ("Ibuprofen", "800", "mg")], doses)
+
     def test_clinical_summary(self):
         """Test the creation of a clinical summary."""
         extractor = TextExtractor()
@@ -12,9 +12,10 @@ if parent_dir not in sys.path:
 
 from src.extraction.factory import get_extractor
 from src.extraction.text_extractor import TextExtractor
-from src.extraction.pdf_extractor import PDFExtractor
+from src.extraction.pdf_extractor import PDFExtractor, _parse_pdf_date
 from src.extraction.html_extractor import HTMLExtractor
 from src.extraction.csv_extractor import CSVExtractor
+from src.extraction.utils import get_document_type_from_path
 
 class TestExtractionComponents(unittest.TestCase):
     """Test suite for document extraction components."""
@@ -57,6 +58,14 @@ class TestExtractionComponents(unittest.TestCase):
         extractor = get_extractor(non_existent_file)
         self.assertIsNone(extractor)
 
+    def test_pdf_date_parsing(self):
+        """Test conversion of PDF info dates, including UTC offsets."""
+        self.assertEqual("2023-01-15T10:30:00-05:00", _parse_pdf_date("D:20230115103000-05'00'"))
+        self.assertEqual("2023-01-15T10:30:00+00:00", _parse_pdf_date("D:20230115103000Z"))
+        self.assertEqual("2023-01-15T10:30:00", _parse_pdf_date("D:20230115103000"))
+        self.assertEqual("2023-01-15", _parse_pdf_date("D:20230115"))
+        self.assertIsNone(_parse_pdf_date("not a date"))
+
     def test_text_extraction(self):
         """Test extraction from text files."""
         # Create a sample text file
@@ -114,6 +123,16 @@ class TestExtractionComponents(unittest.TestCase):
         self.assertIn("Joint Pain", result["content"])
         self.assertIn("confidence_score", result)
 
+    def test_document_type_from_path(self):
+        """Test that path keywords map to document types in priority order."""
+        self.assertEqual(get_document_type_from_path("records/Lab_Results.pdf"), "lab_result")
+        self.assertEqual(get_document_type_from_path("notes/blood_test.txt"), "lab_result")
+        self.assertEqual(get_document_type_from_path("doctor_visit.txt"), "clinical_note")
+        self.assertEqual(get_document_type_from_path("scans/knee_MRI.pdf"), "imaging")
+        self.assertEqual(get_document_type_from_path("my_story.md"), "patient_history")
+        self.assertEqual(get_document_type_from_path("symptom_log.csv"), "symptom_tracker")
+        self.assertEqual(get_document_type_from_path("misc/summary.pdf"), "medical_document")
+
     def tearDown(self):
         """Clean up test environment."""
         # Remove test files
@@ -18,6 +18,9 @@ TOKEN_FILE = 'token.json'
 APPT_QUERY = 'subject:(appointment OR confirmed OR schedule) after:2024/03/01'
 PREP_QUERY = 'from:"Rachel Lee Patient Advocacy" prep'
 
+# Messages fetched per batched API request (Gmail allows up to 100)
+BATCH_SIZE = 50
+
 
 def authenticate_gmail():
     """Authenticate and return Gmail API service."""
@@ -47,33 +50,61 @@ def search_messages(service, user_id: str, query: str) -> List[Dict]:
         return []
 
 
+def parse_message(message: Dict) -> Dict:
+    """Pull the headers, snippet and plain-text body out of a full message."""
+    headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
+    snippet = message.get('snippet', '')
+    body = ''
+    if 'parts' in message['payload']:
+        for part in message['payload']['parts']:
+            if part['mimeType'] == 'text/plain':
+                body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
+                break
+    else:
+        body = base64.urlsafe_b64decode(message['payload']['body'].get('data', '')).decode('utf-8', errors='ignore')
+    return {
+        'id': message['id'],
+        'subject': headers.get('Subject', ''),
+        'from': headers.get('From', ''),
+        'date': headers.get('Date', ''),
+        'snippet': snippet,
+        'body': body,
+    }
+
+
 def get_message_details(service, user_id: str, msg_id: str) -> Dict:
     """Get the details of a message by ID."""
     try:
         message = service.users().messages().get(userId=user_id, id=msg_id, format='full').execute()
-        headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
-        snippet = message.get('snippet', '')
-        body = ''
-        if 'parts' in message['payload']:
-            for part in message['payload']['parts']:
-                if part['mimeType'] == 'text/plain':
-                    body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                    break
-        else:
-            body = base64.urlsafe_b64decode(message['payload']['body'].get('data', '')).decode('utf-8', errors='ignore')
-        return {
-            'id': msg_id,
-            'subject': headers.get('Subject', ''),
-            'from': headers.get('From', ''),
-            'date': headers.get('Date', ''),
-            'snippet': snippet,
-            'body': body,
-        }
+        return parse_message(message)
     except HttpError as error:
         print(f'An error occurred: {error}')
         return {}
 
 
+def get_messages_details(service, user_id: str, msg_ids: List[str]) -> List[Dict]:
+    """Get the details of several messages, BATCH_SIZE messages per HTTP request."""
+    details = {}
+
+    def handle_response(request_id, response, exception):
+        if exception is not None:
+            print(f'An error occurred: {exception}')
+        else:
+            details[request_id] = parse_message(response)
+
+    for start in range(0, len(msg_ids), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=handle_response)
+        for msg_id in msg_ids[start:start + BATCH_SIZE]:
+            batch.add(service.users().messages().get(userId=user_id, id=msg_id, format='full'),
+                      request_id=msg_id)
+        try:
+            batch.execute()
+        except HttpError as error:
+            print(f'An error occurred: {error}')
+
+    return [details[msg_id] for msg_id in msg_ids if msg_id in details]
+
+
 def extract_appointment_info(email: Dict) -> Dict:
     """Extract appointment details from email content."""
     # Simple regex-based extraction (customize as needed)
@@ -109,19 +140,13 @@ def main():
 
     print('Searching for appointment confirmation emails...')
     appt_msgs = search_messages(service, user_id, APPT_QUERY)
-    appt_details = []
-    for msg in appt_msgs:
-        details = get_message_details(service, user_id, msg['id'])
-        if details:
-            appt_details.append(extract_appointment_info(details))
+    appt_details = [extract_appointment_info(details) for details in
+                    get_messages_details(service, user_id, [msg['id'] for msg in appt_msgs])]
 
     print('Searching for Rachel Lee Patient Advocacy prep emails...')
     prep_msgs = search_messages(service, user_id, PREP_QUERY)
-    prep_details = []
-    for msg in prep_msgs:
-        details = get_message_details(service, user_id, msg['id'])
-        if details:
-            prep_details.append(extract_prep_info(details))
+    prep_details = [extract_prep_info(details) for details in
+                    get_messages_details(service, user_id, [msg['id'] for msg in prep_msgs])]
 
     # Output results
     print('\n--- Appointment Confirmations ---')
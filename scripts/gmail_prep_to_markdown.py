@@ -74,15 +74,18 @@ def get_message_details(service, user_id: str, msg_id: str) -> Dict:
 
 
 def write_markdown(emails: List[Dict], filename: str):
+    parts = ['# Medical Prep Emails\n\n']
+    for i, email in enumerate(emails, 1):
+        parts.append(
+            f'## {i}. {email["subject"]}\n'
+            f'- **From:** {email["from"]}\n'
+            f'- **Date:** {email["date"]}\n\n'
+            '---\n'
+            f'{email["body"]}\n'
+            '\n---\n\n'
+        )
     with open(filename, 'w') as f:
-        f.write('# Medical Prep Emails\n\n')
-        for i, email in enumerate(emails, 1):
-            f.write(f'## {i}. {email["subject"]}\n')
-            f.write(f'- **From:** {email["from"]}\n')
-            f.write(f'- **Date:** {email["date"]}\n\n')
-            f.write('---\n')
-            f.write(f'{email["body"]}\n')
-            f.write('\n---\n\n')
+        f.write(''.join(parts))
     print(f'Wrote {len(emails)} emails to {filename}')
 
 